@@ -1,4 +1,15 @@
 from .shopping_agent import ShoppingAgentSession, create_shopping_agent
+from .llm_client import LLMClientPool, get_shared_llm
+from .rate_limiter import LLMAdmissionController, LLMOverloadedError, llm_limiter
 from .tools import tools
 
-__all__ = ["ShoppingAgentSession", "create_shopping_agent", "tools"]
+__all__ = [
+    "ShoppingAgentSession",
+    "create_shopping_agent",
+    "LLMClientPool",
+    "get_shared_llm",
+    "LLMAdmissionController",
+    "LLMOverloadedError",
+    "llm_limiter",
+    "tools"
+]
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+BRANDS = (
+    "samsung", "google", "oneplus", "xiaomi", "redmi", "poco", "realme",
+    "motorola", "nothing", "vivo", "iqoo", "oppo", "apple"
+)
+
+_COMPARE = re.compile(r"\b(compare|vs\.?|versus)\b", re.I)
+_EXPLAIN = re.compile(r"^\s*(?:what\s+is|what's|explain|define)\s+(?:an?\s+|the\s+)?(?P<term>.+?)\s*\??\s*$", re.I)
+_DETAILS = re.compile(r"(?:details|specs|tell\s+me\s+(?:more\s+)?about)\s+(?:of\s+|for\s+|on\s+)?(?:the\s+)?(?P<model>.+?)\s*\??\s*$", re.I)
+_SIMILAR = re.compile(r"(?:similar\s+to|something\s+like|alternatives?\s+to)\s+(?:the\s+)?(?P<model>.+?)(?:\s+but\s+(?P<cheaper>cheaper|less\s+expensive))?\s*\??\s*$", re.I)
+_BUDGET = re.compile(r"(?:under|below|within|up\s*to|less\s+than)\s*(?:rs\.?|₹)?\s*(?P<amount>\d[\d,]*)\s*(?P<k>k)?", re.I)
+_SEPARATORS = re.compile(r"\s*(?:,|\band\b|\bvs\.?\b|\bversus\b|\bwith\b)\s*", re.I)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic offline stand-in for the Gemini chat model.
+    
+    Picks a tool call from simple rules on the latest user message and,
+    once tool results are in, answers with a fixed-shape summary of them.
+    Latency is simulated per call and per streamed chunk, so the rest of
+    the stack (tools, caches, limiter, streaming) runs as in production
+    without spending API quota. Enabled with ``LLM_PROVIDER=fake``.
+    """
+    
+    latency_seconds: float = 0.0
+    chunk_latency_seconds: float = 0.0
+    answer_words: int = 60
+    
+    @property
+    def _llm_type(self) -> str:
+        return "fake-shopping"
+    
+    def bind_tools(self, tools: List[Any], **kwargs: Any) -> "FakeChatModel":
+        # Tool choice is scripted, so the schemas are not needed
+        return self
+    
+    def respond(self, messages: List[BaseMessage]) -> AIMessage:
+        last = messages[-1]
+        prompt_tokens = sum(_estimate_tokens(str(message.content)) for message in messages)
+        
+        if isinstance(last, HumanMessage):
+            tool_call = self._plan_tool_call(str(last.content))
+            message = AIMessage(content="", tool_calls=[tool_call])
+        else:
+            message = AIMessage(content=self._answer(messages))
+        
+        output_tokens = _estimate_tokens(str(message.content) or json.dumps(message.tool_calls[0]["args"]))
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": prompt_tokens + output_tokens
+        }
+        return message
+    
+    def _plan_tool_call(self, text: str) -> dict:
+        call_id = str(uuid.uuid5(uuid.NAMESPACE_URL, text))
+        
+        explain = _EXPLAIN.match(text)
+        if explain and not _BUDGET.search(text):
+            return {"name": "explain_technical_term", "args": {"term": explain.group("term")}, "id": call_id}
+        
+        if _COMPARE.search(text):
+            body = re.sub(r"^\s*compare\s+", "", text, flags=re.I).rstrip(" ?.")
+            models = [part for part in _SEPARATORS.split(body) if part][:3]
+            if len(models) >= 2:
+                return {"name": "compare_phones", "args": {"phone_models": models}, "id": call_id}
+        
+        similar = _SIMILAR.search(text)
+        if similar:
+            args = {"phone_model": similar.group("model"), "cheaper": bool(similar.group("cheaper"))}
+            return {"name": "find_similar_phones", "args": args, "id": call_id}
+        
+        details = _DETAILS.search(text)
+        if details:
+            return {"name": "get_phone_details", "args": {"phone_model": details.group("model")}, "id": call_id}
+        
+        args: dict = {}
+        budget = _BUDGET.search(text)
+        if budget:
+            amount = int(budget.group("amount").replace(",", ""))
+            args["budget_max"] = amount * 1000 if budget.group("k") else amount
+        lowered = text.lower()
+        brand = next((brand for brand in BRANDS if re.search(rf"\b{brand}\b", lowered)), None)
+        if brand:
+            args["brand"] = brand
+        if "camera" in lowered:
+            args["sort_by"] = "camera"
+        elif "battery" in lowered:
+            args["sort_by"] = "battery"
+        return {"name": "search_phones", "args": args, "id": call_id}
+    
+    def _answer(self, messages: List[BaseMessage]) -> str:
+        results = []
+        for message in reversed(messages):
+            if not isinstance(message, ToolMessage):
+                break
+            results.append(str(message.content))
+        summary = " ".join(" ".join(results).replace('"', "").split())
+        words = f"Based on the catalog, here is what I found: {summary}".split()
+        return " ".join(words[:self.answer_words])
+    
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency_seconds)
+        return ChatResult(generations=[ChatGeneration(message=self.respond(messages))])
+    
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency_seconds)
+        return ChatResult(generations=[ChatGeneration(message=self.respond(messages))])
+    
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency_seconds)
+        message = self.respond(messages)
+        
+        if message.tool_calls:
+            chunks = [AIMessageChunk(content="", tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                for index, call in enumerate(message.tool_calls)
+            ])]
+        else:
+            words = message.content.split(" ")
+            chunks = [AIMessageChunk(content=word if i == 0 else f" {word}") for i, word in enumerate(words)]
+        chunks[-1].usage_metadata = message.usage_metadata
+        
+        for index, chunk in enumerate(chunks):
+            if index and self.chunk_latency_seconds:
+                await asyncio.sleep(self.chunk_latency_seconds)
+            yield ChatGenerationChunk(message=chunk)
@@ -0,0 +1,69 @@
+import asyncio
+import itertools
+import threading
+import weakref
+from typing import Any, Callable, List, Optional
+from backend.config import settings
+
+
+class LLMClientPool:
+    """Process-wide pool of tool-bound chat models handed out round-robin.
+    
+    The Gemini async client is tied to the event loop it was created on, so
+    clients are built lazily per loop (and once for plain sync callers).
+    """
+    
+    def __init__(self, factory: Callable[[], Any], size: int = 1):
+        self._factory = factory
+        self.size = max(1, size)
+        self._by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, List[Any]]" = weakref.WeakKeyDictionary()
+        self._sync_clients: Optional[List[Any]] = None
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+    
+    def get(self) -> Any:
+        clients = self._clients_for_current_loop()
+        return clients[next(self._counter) % len(clients)]
+    
+    def reset(self):
+        with self._lock:
+            self._by_loop = weakref.WeakKeyDictionary()
+            self._sync_clients = None
+    
+    def _clients_for_current_loop(self) -> List[Any]:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        clients = self._sync_clients if loop is None else self._by_loop.get(loop)
+        if clients is not None:
+            return clients
+        
+        with self._lock:
+            clients = self._sync_clients if loop is None else self._by_loop.get(loop)
+            if clients is None:
+                clients = [self._factory() for _ in range(self.size)]
+                if loop is None:
+                    self._sync_clients = clients
+                else:
+                    self._by_loop[loop] = clients
+            return clients
+
+
+_pool: Optional[LLMClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_llm_pool() -> LLMClientPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from backend.agents.shopping_agent import create_shopping_agent
+                _pool = LLMClientPool(create_shopping_agent, size=settings.llm_pool_size)
+    return _pool
+
+
+def get_shared_llm() -> Any:
+    return get_llm_pool().get()
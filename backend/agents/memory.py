@@ -0,0 +1,162 @@
+import json
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+
+# Rough size of a token for Gemini-style tokenizers; only used for budgeting
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(message: BaseMessage) -> int:
+    size = len(str(message.content))
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        size += len(tool_call["name"]) + len(json.dumps(tool_call["args"]))
+    return size // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+def split_turns(messages: Sequence[BaseMessage]) -> List[List[BaseMessage]]:
+    """Group messages into turns, each starting at a user message.
+    
+    A turn holds the user message, any tool-call messages with their
+    results, and the final answer, so trimming whole turns never separates
+    a tool call from its result.
+    """
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
+
+
+def encode_message(message: BaseMessage) -> list:
+    """Compact JSON-ready form of a history message: ``[kind, content, ...]``."""
+    if isinstance(message, HumanMessage):
+        return ["h", message.content]
+    if isinstance(message, ToolMessage):
+        return ["t", message.content, message.tool_call_id, message.name]
+    if isinstance(message, AIMessage):
+        if message.tool_calls:
+            return ["a", message.content, [[call["name"], call["args"], call["id"]] for call in message.tool_calls]]
+        return ["a", message.content]
+    raise TypeError(f"Cannot encode {type(message).__name__} in session history")
+
+
+def decode_message(data: list) -> BaseMessage:
+    kind, content, *rest = data
+    if kind == "h":
+        return HumanMessage(content=content)
+    if kind == "t":
+        tool_call_id, name = rest
+        return ToolMessage(content=content, tool_call_id=tool_call_id, name=name)
+    if kind == "a":
+        calls = rest[0] if rest else []
+        return AIMessage(content=content, tool_calls=[{"name": name, "args": args, "id": call_id} for name, args, call_id in calls])
+    raise ValueError(f"Unknown message kind {kind!r} in session history")
+
+
+def _remember(items: List, value, limit: int):
+    # Most recent last; a repeated value moves to the end
+    if value in items:
+        items.remove(value)
+    items.append(value)
+    del items[:-limit]
+
+
+@dataclass
+class ConversationSummary:
+    """Running digest of turns that were trimmed out of the prompt.
+    
+    Built from the tool calls the model made (so budgets and filters are
+    exact) plus short excerpts of the user's own words, without an extra
+    LLM call. Only the structured fields go into the system message; the
+    excerpts are user text and are sent as a user message.
+    """
+    
+    ITEM_CHARS = 40
+    MAX_ITEMS = 8
+    MAX_REQUESTS = 3
+    REQUEST_CHARS = 160
+    
+    budget_min: Optional[int] = None
+    budget_max: Optional[int] = None
+    brands: List[str] = field(default_factory=list)
+    features: List[str] = field(default_factory=list)
+    min_camera_mp: Optional[int] = None
+    min_battery_mah: Optional[int] = None
+    phones: List[str] = field(default_factory=list)
+    requests: List[str] = field(default_factory=list)
+    
+    def __bool__(self) -> bool:
+        return bool(
+            self.budget_min or self.budget_max or self.brands or self.features
+            or self.min_camera_mp or self.min_battery_mah or self.phones or self.requests
+        )
+    
+    def absorb(self, turn: Sequence[BaseMessage]):
+        for message in turn:
+            if isinstance(message, HumanMessage):
+                text = " ".join(str(message.content).split())
+                if len(text) > self.REQUEST_CHARS:
+                    text = text[:self.REQUEST_CHARS - 3] + "..."
+                if text:
+                    _remember(self.requests, text, self.MAX_REQUESTS)
+            for tool_call in getattr(message, "tool_calls", None) or []:
+                self._absorb_tool_call(tool_call["name"], tool_call.get("args") or {})
+    
+    def _absorb_tool_call(self, name: str, args: dict):
+        if name == "search_phones":
+            # The latest search reflects the user's current budget
+            if args.get("budget_min") or args.get("budget_max"):
+                self.budget_min = args.get("budget_min")
+                self.budget_max = args.get("budget_max")
+            if args.get("brand"):
+                _remember(self.brands, args["brand"], self.MAX_ITEMS)
+            features = args.get("features") or []
+            for feature in [features] if isinstance(features, str) else features:
+                _remember(self.features, feature, self.MAX_ITEMS)
+            self.min_camera_mp = args.get("min_camera_mp") or self.min_camera_mp
+            self.min_battery_mah = args.get("min_battery_mah") or self.min_battery_mah
+        elif name == "compare_phones":
+            for model in args.get("phone_models") or []:
+                _remember(self.phones, model, self.MAX_ITEMS)
+        elif name == "find_similar_phones" and args.get("phone_model"):
+            _remember(self.phones, args["phone_model"], self.MAX_ITEMS)
+            if args.get("budget_max"):
+                self.budget_max = args["budget_max"]
+        elif name == "get_phone_details" and args.get("phone_model"):
+            _remember(self.phones, args["phone_model"], self.MAX_ITEMS)
+    
+    def render(self) -> str:
+        lines = []
+        if self.budget_min and self.budget_max:
+            lines.append(f"Budget: ₹{self.budget_min}-₹{self.budget_max}")
+        elif self.budget_max:
+            lines.append(f"Budget: up to ₹{self.budget_max}")
+        elif self.budget_min:
+            lines.append(f"Budget: from ₹{self.budget_min}")
+        if self.brands:
+            lines.append(f"Brands asked about: {self._items(self.brands)}")
+        if self.features:
+            lines.append(f"Must-have features: {self._items(self.features)}")
+        if self.min_camera_mp:
+            lines.append(f"Camera: at least {self.min_camera_mp}MP")
+        if self.min_battery_mah:
+            lines.append(f"Battery: at least {self.min_battery_mah}mAh")
+        if self.phones:
+            lines.append(f"Phones discussed: {self._items(self.phones)}")
+        return "\n".join(f"- {line}" for line in lines)
+    
+    def render_requests(self) -> str:
+        """Excerpts of trimmed user messages, worded as the user's own quoted context."""
+        if not self.requests:
+            return ""
+        quoted = "\n".join(f'- "{text}"' for text in self.requests)
+        return f"(For context, my earlier messages that are no longer shown, quoted:)\n{quoted}"
+    
+    def _items(self, items: List[str]) -> str:
+        # Tool arguments come from user text too; keep them short and on one line
+        return ", ".join(" ".join(str(item).split())[:self.ITEM_CHARS] for item in items)
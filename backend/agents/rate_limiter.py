@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+from backend.config import settings
+from backend.metrics import record_stage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LLMOverloadedError(Exception):
+    """Raised when a model call cannot be admitted in time; callers should retry later."""
+    
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    # google.api_core exceptions carry the HTTP status as `code`
+    return getattr(exc, "code", None) == 429 or getattr(exc, "status_code", None) == 429
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class LLMAdmissionController:
+    """Admission control for upstream model calls.
+    
+    A call needs a concurrency slot and a token from a QPS bucket. Callers
+    that cannot get a slot queue in FIFO order up to ``max_queue``; beyond
+    that, or once ``max_wait_seconds`` have passed, they are rejected with
+    ``LLMOverloadedError`` instead of piling onto the upstream. A 429 from
+    the model pauses the bucket for everyone and the call is retried with
+    jittered exponential backoff.
+    
+    State is guarded by a thread lock and waiters are woken on their own
+    loop, so one controller serves every event loop in the process.
+    A limit of 0 disables that check.
+    """
+    
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        qps: float = 0,
+        burst: int = 1,
+        max_queue: int = 100,
+        max_wait_seconds: float = 10,
+        max_retries: int = 3,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 20,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_concurrency = max_concurrency
+        self.qps = qps
+        self.burst = max(1, burst)
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        
+        self._active = 0
+        self._waiters: deque = deque()
+        self._tokens = float(self.burst)
+        self._refilled_at = clock()
+        self._paused_until = 0.0
+        
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+    
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Run ``call`` under admission control, retrying upstream 429s."""
+        attempt = 0
+        while True:
+            await self.acquire()
+            try:
+                return await call()
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(e, attempt)
+            finally:
+                self.release()
+            attempt += 1
+            self.retries += 1
+            logger.warning(f"Model rate limited, retrying in {delay:.2f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+    
+    async def stream(self, start: Callable[[], AsyncIterator[T]]) -> AsyncIterator[T]:
+        """Stream ``start()`` under admission control.
+        
+        A 429 is only retried before the first chunk; after that the
+        partial output has been delivered and the error is raised.
+        """
+        attempt = 0
+        while True:
+            delivered = False
+            await self.acquire()
+            try:
+                async for chunk in start():
+                    delivered = True
+                    yield chunk
+                return
+            except Exception as e:
+                if delivered or not is_rate_limit_error(e) or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(e, attempt)
+            finally:
+                self.release()
+            attempt += 1
+            self.retries += 1
+            logger.warning(f"Model rate limited, retrying in {delay:.2f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+    
+    async def acquire(self):
+        started = self._clock()
+        deadline = started + self.max_wait_seconds
+        await self._acquire_slot(deadline)
+        try:
+            delay = self._reserve_token()
+            if delay > 0:
+                if self._clock() + delay > deadline:
+                    self._unreserve_token()
+                    with self._lock:
+                        self.rejected_timeout += 1
+                    raise LLMOverloadedError("Model request rate limit reached", retry_after=delay)
+                await asyncio.sleep(delay)
+        except BaseException:
+            self.release()
+            raise
+        
+        waited = self._clock() - started
+        record_stage("llm_queue", waited)
+        with self._lock:
+            self.admitted += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+    
+    def release(self):
+        if not self.max_concurrency:
+            return
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                if not waiter.done():
+                    # The slot passes straight to the next waiter
+                    loop.call_soon_threadsafe(self._hand_over, waiter)
+                    return
+            self._active -= 1
+    
+    def _hand_over(self, waiter: asyncio.Future):
+        if waiter.done():
+            # The waiter gave up between being picked and being woken
+            self.release()
+        else:
+            waiter.set_result(None)
+    
+    async def _acquire_slot(self, deadline: float):
+        if not self.max_concurrency:
+            return
+        
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._active += 1
+                return
+            if len(self._waiters) >= self.max_queue:
+                self.rejected_queue_full += 1
+                raise LLMOverloadedError("Too many requests are waiting for the model", retry_after=1.0)
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+        
+        try:
+            await asyncio.wait_for(waiter, timeout=max(0.0, deadline - self._clock()))
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return
+            with self._lock:
+                self._discard_waiter(loop, waiter)
+                self.rejected_timeout += 1
+            raise LLMOverloadedError("Timed out waiting for the model", retry_after=1.0)
+        except asyncio.CancelledError:
+            # Cancelled after the slot was handed over: pass it on
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                with self._lock:
+                    self._discard_waiter(loop, waiter)
+            raise
+    
+    def _discard_waiter(self, loop: asyncio.AbstractEventLoop, waiter: asyncio.Future):
+        try:
+            self._waiters.remove((loop, waiter))
+        except ValueError:
+            pass  # already handed a slot, which _hand_over passes on
+    
+    def _reserve_token(self) -> float:
+        """Take a token, returning how long to wait before it is valid."""
+        now = self._clock()
+        with self._lock:
+            wait = max(0.0, self._paused_until - now)
+            if not self.qps:
+                return wait
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.qps)
+            self._refilled_at = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.qps)
+            return wait
+    
+    def _unreserve_token(self):
+        if self.qps:
+            with self._lock:
+                self._tokens += 1
+    
+    def _backoff(self, exc: BaseException, attempt: int) -> float:
+        retry_after = retry_after_seconds(exc)
+        if retry_after is None:
+            # Full jitter keeps retrying workers from synchronizing
+            ceiling = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** attempt)
+            retry_after = random.uniform(0, ceiling)
+        with self._lock:
+            self.rate_limited += 1
+            # Everyone backs off, not just the caller that saw the 429
+            self._paused_until = max(self._paused_until, self._clock() + retry_after)
+        return retry_after
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "active": self._active,
+                "queue_depth": len(self._waiters),
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "admitted": self.admitted,
+                "rejected_queue_full": self.rejected_queue_full,
+                "rejected_timeout": self.rejected_timeout,
+                "rate_limited": self.rate_limited,
+                "retries": self.retries,
+                "avg_wait_seconds": self._wait_total / self.admitted if self.admitted else 0.0,
+                "max_wait_seconds": self._wait_max
+            }
+
+
+llm_limiter = LLMAdmissionController(
+    max_concurrency=settings.llm_max_concurrency,
+    qps=settings.llm_max_qps,
+    burst=settings.llm_burst,
+    max_queue=settings.llm_max_queue,
+    max_wait_seconds=settings.llm_max_wait_seconds,
+    max_retries=settings.llm_rate_limit_retries
+)
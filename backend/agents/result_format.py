@@ -0,0 +1,73 @@
+import json
+from typing import Any, Dict, List
+from backend.config import settings
+
+
+RESULT_FORMATS = ("pretty", "compact", "table")
+
+# Header names used by the "table" format; units stay in the name so the
+# model can still read the values without a schema
+SHORT_KEYS: Dict[str, str] = {
+    "display_inches": "display_in",
+    "camera_mp": "cam_mp",
+    "main_mp": "cam_mp",
+    "ultrawide_mp": "uw_mp",
+    "battery_mah": "batt_mah",
+    "fast_charging_w": "charge_w",
+    "processor": "cpu",
+    "storage_gb": "rom_gb",
+    "refresh_rate_hz": "hz",
+    "features": "feat",
+}
+
+DROPPABLE_KEYS = ("pros", "cons")
+
+
+def _drop_keys(value: Any, keys: tuple) -> Any:
+    if isinstance(value, dict):
+        return {k: _drop_keys(v, keys) for k, v in value.items() if k not in keys}
+    if isinstance(value, list):
+        return [_drop_keys(v, keys) for v in value]
+    return value
+
+
+def _shorten(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {SHORT_KEYS.get(k, k): _shorten(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_shorten(v) for v in value]
+    return value
+
+
+def _tabulate(value: Any) -> Any:
+    """Turn lists of same-shaped dicts into {"cols": [...], "rows": [[...]]}."""
+    if isinstance(value, dict):
+        return {k: _tabulate(v) for k, v in value.items()}
+    if isinstance(value, list):
+        if len(value) > 1 and all(isinstance(v, dict) for v in value):
+            columns = list(value[0])
+            if all(list(v) == columns for v in value[1:]):
+                return {"cols": columns, "rows": [[_tabulate(v[c]) for c in columns] for v in value]}
+        return [_tabulate(v) for v in value]
+    return value
+
+
+def encode_result(data: Any, result_format: str = None, include_pros_cons: bool = None) -> str:
+    """Serialize a tool result for the LLM prompt.
+    
+    ``pretty`` is the original indented JSON, ``compact`` drops whitespace,
+    and ``table`` additionally shortens keys and sends multi-phone results
+    as one header row plus value rows.
+    """
+    result_format = result_format or settings.tool_result_format
+    if include_pros_cons is None:
+        include_pros_cons = settings.tool_result_pros_cons
+    
+    if not include_pros_cons:
+        data = _drop_keys(data, DROPPABLE_KEYS)
+    
+    if result_format == "pretty":
+        return json.dumps(data, indent=2)
+    if result_format == "table":
+        data = _tabulate(_shorten(data))
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
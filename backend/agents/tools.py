@@ -1,9 +1,9 @@
 from langchain_core.tools import tool
 from typing import List, Optional, Union
 import logging
-import json
-import os
-from backend.dao import phone_dao
+from backend.agents.result_format import encode_result
+from backend.dao import phone_dao, technical_terms_dao
+from backend.dao.ranking import parse_weights
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +16,8 @@ def search_phones(
     features: Optional[Union[str, List[str]]] = None,
     min_camera_mp: Optional[int] = None,
     min_battery_mah: Optional[int] = None,
-    sort_by: str = "price"
+    sort_by: str = "price",
+    include_facets: bool = False
 ) -> str:
     """Search for mobile phones based on criteria.
     
@@ -27,10 +28,16 @@ def search_phones(
         features: List of required features (5G, OIS, IP68, etc.)
         min_camera_mp: Minimum camera megapixels
         min_battery_mah: Minimum battery capacity in mAh
-        sort_by: Sort results by 'price', 'camera', 'battery', or 'performance'
+        sort_by: Sort results by 'price', 'camera' (main MP), 'battery' (mAh) or 'performance' (RAM);
+            or rank by overall scores with 'balanced', 'value' (value for money), 'gaming', 'photography',
+            or custom weights over camera, battery, performance, display and value, e.g. 'camera:2,battery:1'.
+            Score-ranked results include 0-100 scores, so one search is enough to pick an all-rounder.
+        include_facets: Also return how many phones match in total and per brand, feature, RAM, storage
+            and price bucket, to suggest how to narrow or widen the search
     
     Returns:
         JSON string with matching phones including display size, specs, and features
+        (with include_facets: {"total", "phones", "facets"})
     """
     # Normalize features to list format
     if features and isinstance(features, str):
@@ -42,16 +49,14 @@ def search_phones(
         brand=brand,
         features=features,
         min_camera_mp=min_camera_mp,
-        min_battery_mah=min_battery_mah
+        min_battery_mah=min_battery_mah,
+        sort_by=sort_by,
+        limit=5
     )
     
-    results = phone_dao.sort_phones(results, sort_by)
-    
     if not results:
         return "No phones found matching the criteria."
     
-    results = results[:5]
-    
     phones_data = []
     for phone in results:
         phones_data.append({
@@ -70,7 +75,22 @@ def search_phones(
             "cons": phone.cons
         })
     
-    return json.dumps(phones_data, indent=2)
+    if parse_weights(sort_by):
+        for phone, data in zip(results, phones_data):
+            data["scores"] = phone_dao.score_breakdown(phone)
+    
+    if include_facets:
+        summary = phone_dao.facets(
+            budget_min=budget_min,
+            budget_max=budget_max,
+            brand=brand,
+            features=features,
+            min_camera_mp=min_camera_mp,
+            min_battery_mah=min_battery_mah
+        )
+        return encode_result({"total": summary["total"], "phones": phones_data, "facets": summary["facets"]})
+    
+    return encode_result(phones_data)
 
 
 @tool
@@ -86,11 +106,7 @@ def compare_phones(phone_models: List[str]) -> str:
     if len(phone_models) < 2 or len(phone_models) > 3:
         return "Please provide 2-3 phone models to compare."
     
-    phones = []
-    for model in phone_models:
-        phone = phone_dao.get_by_model(model)
-        if phone:
-            phones.append(phone)
+    phones = [phone for phone in phone_dao.get_by_models(phone_models) if phone]
     
     if len(phones) < 2:
         return f"Could not find all requested phones. Found: {[p.model for p in phones]}"
@@ -121,7 +137,7 @@ def compare_phones(phone_models: List[str]) -> str:
             "cons": phone.cons
         })
     
-    return json.dumps(comparison, indent=2)
+    return encode_result(comparison)
 
 
 @tool
@@ -164,48 +180,68 @@ def get_phone_details(phone_model: str) -> str:
         "cons": phone.cons
     }
     
-    return json.dumps(details, indent=2)
+    return encode_result(details)
 
 
-def _load_technical_terms():
-    """Load technical terms from database file"""
-    terms_file = os.path.join(os.path.dirname(__file__), '../data/technical_terms.json')
+@tool
+def find_similar_phones(
+    phone_model: str,
+    budget_min: Optional[int] = None,
+    budget_max: Optional[int] = None,
+    brand: Optional[str] = None,
+    cheaper: bool = False
+) -> str:
+    """Find the phones most similar in specs and features to a given phone, in one call.
+    Use for requests like "something like the Pixel 8a but cheaper" or "alternatives to the Galaxy S23 FE".
     
-    try:
-        with open(terms_file, 'r') as f:
-            terms_data = json.load(f)
-        
-        # Create lookup dictionary
-        terms_dict = {}
-        for term_info in terms_data:
-            term_key = term_info['term'].lower()
-            terms_dict[term_key] = term_info
-            # Also add full name as key
-            if term_info.get('full_name'):
-                terms_dict[term_info['full_name'].lower()] = term_info
-        
-        return terms_dict
-    except Exception as e:
-        logger.error(f"Error loading technical terms: {e}", exc_info=True)
-        return {}
-
-
-def _get_phones_with_feature(feature: str):
-    """Get phones from database that have a specific feature"""
-    all_phones = phone_dao.get_all()
-    matching_phones = []
+    Args:
+        phone_model: The reference phone's model name or brand + model
+        budget_min: Minimum price in INR
+        budget_max: Maximum price in INR
+        brand: Only return phones of this brand
+        cheaper: Only return phones cheaper than the reference phone
+    
+    Returns:
+        JSON string with the reference phone and up to 5 similar phones, most similar first,
+        each with a 0-100 similarity score
+    """
+    reference, neighbours = phone_dao.find_similar(
+        phone_model,
+        limit=5,
+        budget_min=budget_min,
+        budget_max=budget_max,
+        brand=brand,
+        cheaper=cheaper
+    )
+    if reference is None:
+        return f"Phone '{phone_model}' not found in database."
+    if not neighbours:
+        return f"No phones similar to {reference.brand} {reference.model} match those constraints."
     
-    feature_lower = feature.lower()
+    def summary(phone) -> dict:
+        return {
+            "id": phone.id,
+            "brand": phone.brand,
+            "model": phone.model,
+            "price": phone.price,
+            "display_inches": phone.specs.display_inches,
+            "camera_mp": phone.specs.camera.main_mp,
+            "battery_mah": phone.specs.battery_mah,
+            "processor": phone.specs.processor,
+            "ram_gb": phone.specs.ram_gb,
+            "storage_gb": phone.specs.storage_gb,
+            "features": phone.features
+        }
     
-    for phone in all_phones:
-        # Check in features
-        if any(feature_lower in f.lower() for f in phone.features):
-            matching_phones.append(f"{phone.brand} {phone.model}")
-        # Check in camera features
-        elif any(feature_lower in cf.lower() for cf in phone.specs.camera.features):
-            matching_phones.append(f"{phone.brand} {phone.model}")
+    similar = []
+    for phone, score in neighbours:
+        data = summary(phone)
+        data["similarity"] = max(0, round(score * 100))
+        data["pros"] = phone.pros
+        data["cons"] = phone.cons
+        similar.append(data)
     
-    return matching_phones[:5]  # Return max 5 examples
+    return encode_result({"reference": summary(reference), "similar": similar})
 
 
 @tool
@@ -221,8 +257,8 @@ def explain_technical_term(term: str) -> str:
     """
     term_lower = term.lower().strip()
     
-    # Load technical terms from database
-    terms_db = _load_technical_terms()
+    # Cached, read-only view of the technical terms database
+    terms_db = technical_terms_dao.get_all()
     
     # Handle comparison queries (e.g., "OIS vs EIS", "AMOLED vs LCD")
     if " vs " in term_lower or " versus " in term_lower:
@@ -236,8 +272,8 @@ def explain_technical_term(term: str) -> str:
             
             if term1_data and term2_data:
                 # Get phones with each feature
-                phones1 = _get_phones_with_feature(term1)
-                phones2 = _get_phones_with_feature(term2)
+                phones1 = technical_terms_dao.example_phones(term1)
+                phones2 = technical_terms_dao.example_phones(term2)
                 
                 result = f"""**{term1_data['full_name']} ({term1_data['term']}):**
 {term1_data['explanation']}
@@ -259,7 +295,7 @@ Phones with {term2_data['term']}: {', '.join(phones2) if phones2 else 'Check our
     term_data = terms_db.get(term_lower)
     if term_data:
         # Get phones with this feature
-        phones = _get_phones_with_feature(term_data['term'])
+        phones = technical_terms_dao.example_phones(term_data['term'])
         
         result = f"""**{term_data['full_name']} ({term_data['term']})**
 
@@ -275,7 +311,7 @@ Phones with {term2_data['term']}: {', '.join(phones2) if phones2 else 'Check our
         return result
     
     # Term not found - out of context question
-    available_terms = sorted(set([t['term'] for t in terms_db.values() if 'term' in t]))[:10]
+    available_terms = technical_terms_dao.available_terms()[:10]
     return f"""I don't have information about '{term}' in my mobile phone technical terms database.
 
 I can explain these mobile phone features: {', '.join(available_terms)}
@@ -283,4 +319,4 @@ I can explain these mobile phone features: {', '.join(available_terms)}
 Would you like to know about any of these? Or ask me to search for phones with specific features!"""
 
 
-tools = [search_phones, compare_phones, get_phone_details, explain_technical_term]
+tools = [search_phones, compare_phones, get_phone_details, find_similar_phones, explain_technical_term]
@@ -0,0 +1,231 @@
+import base64
+import gzip
+import hashlib
+import json
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from backend.dao import CatalogSnapshot
+from backend.dto import PhoneDTO
+
+
+MAX_PAGE_SIZE = 100
+DEFAULT_PAGE_SIZE = 20
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    body: bytes
+    gzipped: Optional[bytes]
+    etag: str
+    next_cursor: Optional[str] = None
+    
+    @property
+    def gzip_etag(self) -> str:
+        # The gzip body is a different representation, so it gets its own strong tag
+        return f'{self.etag[:-1]}-gz"'
+
+
+def _field_paths(model: type, prefix: str = "") -> List[str]:
+    paths = []
+    for name, field in model.model_fields.items():
+        path = f"{prefix}{name}"
+        paths.append(path)
+        if isinstance(field.annotation, type) and issubclass(field.annotation, BaseModel):
+            paths.extend(_field_paths(field.annotation, f"{path}."))
+    return paths
+
+
+PHONE_FIELDS = frozenset(_field_paths(PhoneDTO))
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """``"brand,model,specs.camera.main_mp"`` -> sorted field paths; ``id`` is always included."""
+    if not fields:
+        return None
+    paths = {path.strip() for path in fields.split(",") if path.strip()}
+    unknown = sorted(paths - PHONE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    paths.add("id")
+    # "specs" already covers "specs.camera.main_mp"
+    return tuple(sorted(path for path in paths if not any(path.startswith(f"{other}.") for other in paths)))
+
+
+def encode_cursor(phone_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{phone_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, phone_id = text.split(":", 1)
+        if prefix != "id":
+            raise ValueError
+        return int(phone_id)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def _project(record: Dict[str, Any], paths: Sequence[str]) -> Dict[str, Any]:
+    projected: Dict[str, Any] = {}
+    for path in paths:
+        *parents, leaf = path.split(".")
+        source, target = record, projected
+        for parent in parents:
+            source = source[parent]
+            target = target.setdefault(parent, {})
+        target[leaf] = source[leaf]
+    return projected
+
+
+_MISS = object()
+
+
+class _Catalog:
+    """JSON-ready records for one catalog version, in catalog order and in id order."""
+    
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.version = snapshot.version
+        self.records = [phone.model_dump(mode="json") for phone in snapshot.phones]
+        self.by_id = {record["id"]: record for record in reversed(self.records)}
+        self.ids = sorted(self.by_id)
+
+
+class PhoneResponseCache:
+    """Pre-rendered ``/api/phones`` bodies with ETags and gzip variants, per catalog version.
+    
+    The full catalog and every distinct page, projection or single-phone
+    response are serialized and compressed once, then served as bytes until
+    the catalog version changes.
+    """
+    
+    def __init__(self, max_entries: int = 512, min_gzip_bytes: int = 1024):
+        self.max_entries = max_entries
+        self.min_gzip_bytes = min_gzip_bytes
+        self._catalog: Optional[_Catalog] = None
+        self._entries: "OrderedDict[tuple, Optional[RenderedResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def list_phones(
+        self,
+        snapshot: CatalogSnapshot,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> RenderedResponse:
+        """All phones in catalog order, or one page in id order when ``limit`` or ``cursor`` is given.
+        
+        Raises ValueError for an unknown field or a malformed cursor.
+        """
+        return self._get(snapshot, *self._list_request(limit, cursor, fields))
+    
+    async def alist_phones(
+        self,
+        snapshot: CatalogSnapshot,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> RenderedResponse:
+        return await self._aget(snapshot, *self._list_request(limit, cursor, fields))
+    
+    def get_phone(self, snapshot: CatalogSnapshot, phone_id: int, fields: Optional[str] = None) -> Optional[RenderedResponse]:
+        return self._get(snapshot, *self._phone_request(phone_id, fields))
+    
+    async def aget_phone(self, snapshot: CatalogSnapshot, phone_id: int, fields: Optional[str] = None) -> Optional[RenderedResponse]:
+        return await self._aget(snapshot, *self._phone_request(phone_id, fields))
+    
+    def _list_request(self, limit: Optional[int], cursor: Optional[str], fields: Optional[str]):
+        paths = parse_fields(fields)
+        after = decode_cursor(cursor) if cursor else None
+        if limit is None and after is not None:
+            limit = DEFAULT_PAGE_SIZE
+        key = ("list", limit, after, paths)
+        return key, lambda catalog: self._render_list(catalog, limit, after, paths)
+    
+    def _phone_request(self, phone_id: int, fields: Optional[str]):
+        paths = parse_fields(fields)
+        key = ("phone", phone_id, paths)
+        return key, lambda catalog: self._render_phone(catalog, phone_id, paths)
+    
+    async def _aget(self, snapshot: CatalogSnapshot, key: tuple, render: Callable[[_Catalog], Optional[RenderedResponse]]):
+        # Hits are served inline; dumping a new catalog version and rendering
+        # a miss take milliseconds, so those run in a worker thread
+        _, rendered = self._lookup(snapshot, key)
+        if rendered is not _MISS:
+            return rendered
+        return await run_in_threadpool(self._get, snapshot, key, render)
+    
+    def _get(self, snapshot: CatalogSnapshot, key: tuple, render: Callable[[_Catalog], Optional[RenderedResponse]]):
+        catalog, rendered = self._lookup(snapshot, key)
+        if rendered is not _MISS:
+            return rendered
+        if catalog is None:
+            # Built outside the lock so async hits never wait on a full catalog dump
+            fresh = _Catalog(snapshot)
+            with self._lock:
+                if self._catalog is None or self._catalog.version != snapshot.version:
+                    self._catalog = fresh
+                    self._entries.clear()
+                catalog = self._catalog
+        
+        # Rendering happens outside the lock; a concurrent miss renders twice
+        rendered = render(catalog)
+        with self._lock:
+            self.misses += 1
+            if self._catalog is catalog:
+                self._entries[key] = rendered
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return rendered
+    
+    def _lookup(self, snapshot: CatalogSnapshot, key: tuple) -> Tuple[Optional[_Catalog], Any]:
+        """(catalog, cached response or _MISS); catalog is None when it is not at ``snapshot``'s version."""
+        with self._lock:
+            catalog = self._catalog
+            if catalog is None or catalog.version != snapshot.version:
+                return None, _MISS
+            rendered = self._entries.get(key, _MISS)
+            if rendered is not _MISS:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return catalog, rendered
+    
+    def _render_list(self, catalog: _Catalog, limit: Optional[int], after: Optional[int], paths) -> RenderedResponse:
+        if limit is None:
+            records, next_cursor = catalog.records, None
+        else:
+            start = bisect_right(catalog.ids, after) if after is not None else 0
+            page_ids = catalog.ids[start:start + limit]
+            records = [catalog.by_id[phone_id] for phone_id in page_ids]
+            more = start + limit < len(catalog.ids)
+            next_cursor = encode_cursor(page_ids[-1]) if more and page_ids else None
+        if paths:
+            records = [_project(record, paths) for record in records]
+        return self._encode(records, next_cursor)
+    
+    def _render_phone(self, catalog: _Catalog, phone_id: int, paths) -> Optional[RenderedResponse]:
+        record = catalog.by_id.get(phone_id)
+        if record is None:
+            return None
+        return self._encode(_project(record, paths) if paths else record)
+    
+    def _encode(self, payload: Any, next_cursor: Optional[str] = None) -> RenderedResponse:
+        # Same bytes FastAPI's JSONResponse would produce
+        body = json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+        gzipped = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= self.min_gzip_bytes else None
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        return RenderedResponse(body, gzipped, etag, next_cursor)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+phone_responses = PhoneResponseCache()
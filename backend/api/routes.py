@@ -1,43 +1,198 @@
-from fastapi import APIRouter, HTTPException
+import secrets
+import sys
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from backend.api.phone_responses import MAX_PAGE_SIZE, RenderedResponse, phone_responses
+from backend.config import settings
 from backend.dto import ChatRequest, ChatResponse, PhoneDTO
-from backend.services import chat_service
+from backend import services
+from backend.services import warmup
 from backend.dao import phone_dao
-from typing import List
+from backend.metrics import registry
+from typing import List, Optional
 
 router = APIRouter()
 
+# Bodies are pre-rendered bytes, so the schemas are documented rather than enforced
+_PROJECTION_NOTE = "With `fields`, only the requested fields (plus `id`) are included."
+
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
-    response, session_id = chat_service.chat(request.message, request.session_id)
+    response, session_id = await services.chat_service.achat(request.message, request.session_id)
     return ChatResponse(
         response=response,
         session_id=session_id
     )
 
 
-@router.get("/phones", response_model=List[PhoneDTO])
-async def get_phones():
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    async def event_source():
+        async for event in services.chat_service.astream(request.message, request.session_id):
+            yield f"data: {event.model_dump_json(exclude_none=True)}\n\n"
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip; ``gzip;q=0`` refuses it."""
+    qualities = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def _rendered_response(request: Request, rendered: RenderedResponse) -> Response:
+    gzipped = rendered.gzipped is not None and _accepts_gzip(request.headers.get("accept-encoding", ""))
+    etag = rendered.gzip_etag if gzipped else rendered.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if rendered.next_cursor:
+        headers["X-Next-Cursor"] = rendered.next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(cursor=rendered.next_cursor)}>; rel="next"'
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(rendered.gzipped, media_type="application/json", headers=headers)
+    return Response(rendered.body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/phones",
+    response_class=Response,
+    responses={
+        200: {"model": List[PhoneDTO], "description": f"Phones in catalog order, or one page in id order. {_PROJECTION_NOTE}"},
+        304: {"description": "Not modified; the If-None-Match ETag is current"},
+        400: {"description": "Unknown field or malformed cursor"},
+    }
+)
+async def get_phones(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. brand,model,price,specs.camera")
+):
     try:
-        phones = phone_dao.get_all()
-        return phones
+        rendered = await phone_responses.alist_phones(phone_dao.snapshot, limit=limit, cursor=cursor, fields=fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
+    return _rendered_response(request, rendered)
 
 
-@router.get("/phones/{phone_id}", response_model=PhoneDTO)
-async def get_phone(phone_id: int):
+@router.get("/phones/facets")
+async def get_phone_facets(
+    budget_min: Optional[int] = None,
+    budget_max: Optional[int] = None,
+    brand: Optional[str] = None,
+    features: Optional[str] = Query(None, description="Comma-separated features, e.g. 5G,AMOLED"),
+    min_camera_mp: Optional[int] = None,
+    min_battery_mah: Optional[int] = None,
+    min_ram_gb: Optional[int] = None
+):
     try:
-        phone = phone_dao.get_by_id(phone_id)
-        if not phone:
-            raise HTTPException(status_code=404, detail="Phone not found")
-        return phone
-    except HTTPException:
-        raise
+        return phone_dao.facets(
+            budget_min=budget_min,
+            budget_max=budget_max,
+            brand=brand,
+            features=[f.strip() for f in features.split(",") if f.strip()] if features else None,
+            min_camera_mp=min_camera_mp,
+            min_battery_mah=min_battery_mah,
+            min_ram_gb=min_ram_gb
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get(
+    "/phones/{phone_id}",
+    response_class=Response,
+    responses={
+        200: {"model": PhoneDTO, "description": f"The phone. {_PROJECTION_NOTE}"},
+        304: {"description": "Not modified; the If-None-Match ETag is current"},
+        400: {"description": "Unknown field"},
+        404: {"description": "Phone not found"},
+    }
+)
+async def get_phone(request: Request, phone_id: int, fields: Optional[str] = None):
+    try:
+        rendered = await phone_responses.aget_phone(phone_dao.snapshot, phone_id, fields=fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+    if rendered is None:
+        raise HTTPException(status_code=404, detail="Phone not found")
+    return _rendered_response(request, rendered)
+
+
 @router.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@router.get("/ready")
+async def readiness(response: Response):
+    # Liveness is /health; this turns 200 once the opt-in warm-up has finished
+    if not warmup.ready:
+        response.status_code = 503
+    return {
+        "ready": warmup.ready,
+        "chat_loaded": "backend.services.chat_service" in sys.modules,
+        "warmup": warmup.stats(),
+        "catalog": phone_dao.stats()
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    
+    # Scraping metrics should not be what loads the chat stack
+    if "backend.services.chat_service" in sys.modules:
+        # Shared session stores count rows in SQLite or Redis
+        gauges = {"shopping_session_store": await run_in_threadpool(services.chat_service.session_stats)}
+        for component, stats in services.chat_service.runtime_stats().items():
+            gauges[f"shopping_{component}"] = stats
+    else:
+        gauges = {"shopping_catalog": phone_dao.stats()}
+    gauges["shopping_phone_responses"] = phone_responses.stats()
+    return PlainTextResponse(registry.render(gauges), media_type="text/plain; version=0.0.4")
+
+
+@router.post("/admin/catalog/reload")
+async def reload_catalog(x_admin_token: Optional[str] = Header(None)):
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Admin API is disabled")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    
+    try:
+        # Parsing and index building stay off the event loop
+        previous, current = await run_in_threadpool(phone_dao.reload)
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Catalog reload failed: {e}")
+    return {"previous_version": previous, "version": current, "changed": previous != current, **phone_dao.stats()}
@@ -0,0 +1,21 @@
+from .response_cache import (
+    ResponseCache,
+    answer_cache,
+    data_version,
+    normalize_message,
+    tool_cache,
+    tool_cache_key
+)
+from .single_flight import SingleFlight, answer_flight, tool_flight
+
+__all__ = [
+    "ResponseCache",
+    "SingleFlight",
+    "answer_flight",
+    "answer_cache",
+    "data_version",
+    "normalize_message",
+    "tool_cache",
+    "tool_cache_key",
+    "tool_flight"
+]
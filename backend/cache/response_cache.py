@@ -0,0 +1,148 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+from backend.config import settings
+from backend.dao import phone_dao, technical_terms_dao
+
+
+@dataclass
+class _Entry:
+    value: str
+    expires_at: float
+    size: int
+
+
+class ResponseCache:
+    """LRU cache of string responses with a TTL, entry and byte limits, and hit/miss stats.
+    
+    Every read and write carries the data version it was computed against;
+    when the version changes the whole cache is dropped.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        max_bytes: int = 16 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    def get(self, key: str, version: str) -> Optional[str]:
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= self._clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+    
+    def set(self, key: str, value: str, version: str):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, self._clock() + self.ttl_seconds, size)
+            self._bytes += size
+            
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+    
+    def _check_version(self, version: str):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+    
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+def data_version() -> str:
+    """Version of everything tool output depends on: the catalog and the terms database."""
+    return f"{phone_dao.version}:{technical_terms_dao.version}"
+
+
+def tool_cache_key(tool_name: str, tool_args: Dict[str, Any]) -> str:
+    # Omitted and None arguments mean the same thing to every tool
+    args = {name: value for name, value in tool_args.items() if value is not None}
+    return f"{tool_name}:{json.dumps(args, sort_keys=True, separators=(',', ':'), default=str)}"
+
+
+_THOUSANDS = re.compile(r"(\d+(?:\.\d+)?)\s*k\b")
+
+
+def normalize_message(message: str) -> str:
+    """Cache key for first-turn questions that differ only in case, spacing, punctuation or number style."""
+    text = message.lower().replace("₹", " ").replace("rs.", " ")
+    text = re.sub(r"(?<=\d),(?=\d)", "", text)
+    text = _THOUSANDS.sub(lambda m: str(int(float(m.group(1)) * 1000)), text)
+    text = re.sub(r"[^\w\s+.]", " ", text)
+    text = re.sub(r"\.(?!\d)", " ", text)
+    return " ".join(text.split())
+
+
+tool_cache = ResponseCache(
+    max_entries=settings.tool_cache_max_entries,
+    ttl_seconds=settings.tool_cache_ttl_seconds,
+    max_bytes=settings.tool_cache_max_bytes
+)
+
+answer_cache = ResponseCache(
+    max_entries=settings.answer_cache_max_entries,
+    ttl_seconds=settings.answer_cache_ttl_seconds,
+    max_bytes=settings.answer_cache_max_bytes
+)
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+from functools import partial
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+
+
+def _copy_outcome(source: asyncio.Future, target: asyncio.Future):
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class SingleFlight:
+    """Coalesces concurrent identical work on an event loop.
+    
+    The first caller for a key becomes the leader and does the work; callers
+    arriving while it is in flight wait for the same result instead of
+    repeating it. Keys are forgotten as soon as the work finishes, so this
+    never serves stale results; caching is left to ``ResponseCache``.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+    
+    def acquire(self, key: Hashable) -> Tuple[asyncio.Future, bool]:
+        """Return the shared future for ``key`` and whether the caller leads.
+        
+        A leader must resolve the future (result or exception) when done.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            future = self._calls.get(key)
+            # Futures are bound to their loop, so work on another loop is not shared
+            if future is not None and not future.done() and future.get_loop() is loop:
+                self.coalesced += 1
+                return future, False
+            
+            future = loop.create_future()
+            self._calls[key] = future
+            self.leaders += 1
+        future.add_done_callback(partial(self._forget, key))
+        return future, True
+    
+    def share(self, key: Hashable, start: Callable[[], Awaitable]) -> asyncio.Future:
+        """Run ``start()`` for ``key`` unless identical work is already in flight.
+        
+        Every caller gets its own shielded waiter, so one caller being
+        cancelled does not cancel the work for the others.
+        """
+        shared, leader = self.acquire(key)
+        if leader:
+            work = asyncio.ensure_future(start())
+            work.add_done_callback(partial(_copy_outcome, target=shared))
+        return asyncio.shield(shared)
+    
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if not future.cancelled():
+            # Mark the exception retrieved; waiters, if any, re-raise it themselves
+            future.exception()
+    
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = len(self._calls)
+        return {"in_flight": in_flight, "leaders": self.leaders, "coalesced": self.coalesced}
+
+
+tool_flight = SingleFlight()
+answer_flight = SingleFlight()
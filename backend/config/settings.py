@@ -1,12 +1,56 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
     google_api_key: str
     environment: str = "development"
     log_level: str = "INFO"
+    metrics_enabled: bool = True
+    metrics_timing_header: bool = False
+    warmup_enabled: bool = False
     cors_origins: str = "*"
+    llm_provider: str = "gemini"
+    llm_model: str = "gemini-3-flash-preview"
+    llm_temperature: float = 0.3
+    llm_pool_size: int = 2
+    fake_llm_latency_ms: float = 400
+    fake_llm_chunk_latency_ms: float = 5
+    llm_timeout_seconds: Optional[float] = None
+    llm_max_concurrency: int = 16
+    llm_max_qps: float = 0
+    llm_burst: int = 4
+    llm_max_queue: int = 200
+    llm_max_wait_seconds: float = 15
+    llm_rate_limit_retries: int = 3
+    fast_path_enabled: bool = True
+    history_token_budget: int = 3000
+    history_summary_enabled: bool = True
+    tool_max_workers: int = 8
+    single_flight_enabled: bool = True
+    tool_result_format: str = "table"
+    tool_result_pros_cons: bool = True
+    tool_cache_enabled: bool = True
+    tool_cache_max_entries: int = 2048
+    tool_cache_ttl_seconds: int = 3600
+    tool_cache_max_bytes: int = 32 * 1024 * 1024
+    answer_cache_enabled: bool = True
+    answer_cache_max_entries: int = 1024
+    answer_cache_ttl_seconds: int = 900
+    answer_cache_max_bytes: int = 16 * 1024 * 1024
+    catalog_backend: str = "index"
+    catalog_reload_interval_seconds: float = 5.0
+    catalog_snapshot_enabled: bool = True
+    admin_token: Optional[str] = None
+    technical_terms_reload_interval_seconds: float = 5.0
+    session_store_backend: str = "memory"
+    session_max_count: int = 10000
+    session_ttl_seconds: int = 3600
+    session_max_history_bytes: int = 256 * 1024 * 1024
+    session_sqlite_path: str = "sessions.sqlite3"
+    session_redis_url: str = "redis://localhost:6379/0"
+    session_write_behind_ms: float = 50
+    session_write_batch_size: int = 100
     
     @property
     def cors_origins_list(self) -> List[str]:
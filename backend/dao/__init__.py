@@ -1,3 +1,15 @@
-from .phone_dao import PhoneDAO, phone_dao
+from .phone_index import PhoneIndex
+from .name_index import ModelNameIndex
+from .phone_dao import CatalogSnapshot, PhoneDAO, phone_dao
+from .technical_terms_dao import TechnicalTermsDAO, technical_terms_dao
 
-__all__ = ["PhoneDAO", "phone_dao"]
+
+def __getattr__(name: str):
+    # The columnar backend imports NumPy; load it only when asked for
+    if name == "ColumnarPhoneIndex":
+        from .columnar import ColumnarPhoneIndex
+        return ColumnarPhoneIndex
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["CatalogSnapshot", "PhoneDAO", "PhoneIndex", "ColumnarPhoneIndex", "ModelNameIndex", "phone_dao", "TechnicalTermsDAO", "technical_terms_dao"]
@@ -0,0 +1,73 @@
+"""Precompiled phone catalog: validated PhoneDTOs pickled next to phones.json.
+
+    python -m backend.dao.catalog_snapshot [phones.json] [output]
+
+Loading one skips JSON parsing and Pydantic validation at startup. A
+snapshot records the content hash of the JSON it was built from and is
+ignored once that file changes, so a stale one only costs the normal load.
+Snapshots are pickles: only load ones your own build produced.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+from typing import List, Optional
+from backend.dto import PhoneDTO
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+
+def content_version(raw: bytes) -> str:
+    # Content hash; caches derived from the catalog key on it
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def parse_phones(raw: bytes) -> List[PhoneDTO]:
+    return [PhoneDTO(**phone) for phone in json.loads(raw)['phones']]
+
+
+def snapshot_path(data_file: str) -> str:
+    return f"{os.path.splitext(data_file)[0]}.snapshot"
+
+
+def write_snapshot(path: str, phones: List[PhoneDTO], version: str):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({"format": SNAPSHOT_FORMAT, "version": version, "phones": phones}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str, version: str) -> Optional[List[PhoneDTO]]:
+    """Phones from the snapshot at ``path``, or None if it is missing, stale or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable catalog snapshot {path}: {e}")
+        return None
+    if data.get("format") != SNAPSHOT_FORMAT or data.get("version") != version:
+        logger.info(f"Catalog snapshot {path} is out of date; loading the JSON catalog")
+        return None
+    return data["phones"]
+
+
+def main(argv: List[str]):
+    from backend.dao.phone_dao import DEFAULT_PHONES_FILE
+    data_file = argv[0] if argv else DEFAULT_PHONES_FILE
+    path = argv[1] if len(argv) > 1 else snapshot_path(data_file)
+    with open(data_file, 'rb') as f:
+        raw = f.read()
+    phones = parse_phones(raw)
+    version = content_version(raw)
+    write_snapshot(path, phones, version)
+    print(f"Wrote {len(phones)} phones (version {version}) to {os.path.normpath(path)}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
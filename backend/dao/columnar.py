@@ -0,0 +1,294 @@
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+from backend.dto import PhoneDTO
+from backend.dao.facets import PRICE_EDGES, PRICE_LABELS, ordered_counts, tier_label
+from backend.dao.ranking import CRITERIA, PhoneScores, parse_weights
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; PhoneDAO falls back to PhoneIndex
+    np = None
+
+
+NUMERIC_COLUMNS = (
+    "price",
+    "main_mp",
+    "battery_mah",
+    "fast_charging_w",
+    "ram_gb",
+    "storage_gb",
+    "display_inches",
+    "refresh_rate_hz",
+    "weight_g",
+)
+
+# sort_by -> (column, descending), matching PhoneDAO.sort_phones
+SORT_COLUMNS = {
+    "price": ("price", False),
+    "camera": ("main_mp", True),
+    "battery": ("battery_mah", True),
+    "performance": ("ram_gb", True),
+    "price_desc": ("price", True),
+}
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class ColumnarScores(PhoneScores):
+    """PhoneScores whose composites are one matrix-vector product over the score columns."""
+    
+    def __init__(self, phones: Sequence[PhoneDTO]):
+        super().__init__(phones)
+        self._matrix = np.array([self.columns[name] for name in CRITERIA], dtype=np.float64)
+    
+    def _weighted_sum(self, weights) -> "np.ndarray":
+        positions = [CRITERIA.index(name) for name, _ in weights]
+        return np.array([weight for _, weight in weights]) @ self._matrix[positions]
+
+
+def _record_row(record: Mapping[str, Any]) -> tuple:
+    specs = record["specs"]
+    return (
+        record["price"],
+        specs["camera"]["main_mp"],
+        specs["battery_mah"],
+        specs["fast_charging_w"],
+        specs["ram_gb"],
+        specs["storage_gb"],
+        specs["display_inches"],
+        specs["refresh_rate_hz"],
+        specs["weight_g"],
+    )
+
+
+def _phone_row(phone: PhoneDTO) -> tuple:
+    specs = phone.specs
+    return (
+        phone.price,
+        specs.camera.main_mp,
+        specs.battery_mah,
+        specs.fast_charging_w,
+        specs.ram_gb,
+        specs.storage_gb,
+        specs.display_inches,
+        specs.refresh_rate_hz,
+        specs.weight_g,
+    )
+
+
+class ColumnarPhoneIndex:
+    """NumPy column store with the same query interface as PhoneIndex.
+    
+    Numeric specs live in one array per column, brands as integer codes and
+    features as a packed bit matrix (one uint64 word per 64 features).
+    Filters are vectorized boolean masks and top-k uses np.partition, so
+    ``PhoneDTO`` objects are only touched for the rows that are returned.
+    """
+    
+    def __init__(
+        self,
+        numeric_rows: Sequence[tuple],
+        brands: Sequence[str],
+        features: Sequence[Iterable[str]],
+        row_loader: Callable[[int], PhoneDTO]
+    ):
+        if np is None:
+            raise RuntimeError("numpy is required for the columnar catalog backend")
+        
+        self.size = len(brands)
+        self._row_loader = row_loader
+        
+        table = np.array(numeric_rows, dtype=np.float64).reshape(self.size, len(NUMERIC_COLUMNS))
+        self.columns: Dict[str, "np.ndarray"] = {}
+        for position, name in enumerate(NUMERIC_COLUMNS):
+            column = table[:, position]
+            self.columns[name] = column if name == "display_inches" else column.astype(np.int64)
+        
+        # Codes are per lower-cased name; labels keep the first spelling seen, for facets
+        brand_vocab: Dict[str, int] = {}
+        self.brand_labels: List[str] = []
+        
+        def brand_code(brand: str) -> int:
+            code = brand_vocab.setdefault(brand.lower(), len(brand_vocab))
+            if code == len(self.brand_labels):
+                self.brand_labels.append(brand)
+            return code
+        
+        self.brand_codes = np.fromiter((brand_code(brand) for brand in brands), dtype=np.int32, count=self.size)
+        self.brand_vocab = brand_vocab
+        
+        feature_vocab: Dict[str, int] = {}
+        self.feature_labels: List[str] = []
+        pair_rows: List[int] = []
+        pair_codes: List[int] = []
+        for row, phone_features in enumerate(features):
+            codes = set()
+            for feature in phone_features:
+                code = feature_vocab.setdefault(feature.lower(), len(feature_vocab))
+                if code == len(self.feature_labels):
+                    self.feature_labels.append(feature)
+                codes.add(code)
+            for code in codes:
+                pair_rows.append(row)
+                pair_codes.append(code)
+        self.feature_vocab = feature_vocab
+        
+        words = max(1, (len(feature_vocab) + 63) // 64)
+        self.feature_bits = np.zeros((self.size, words), dtype=np.uint64)
+        if pair_codes:
+            codes = np.array(pair_codes, dtype=np.uint64)
+            np.bitwise_or.at(
+                self.feature_bits,
+                (np.array(pair_rows, dtype=np.int64), (codes >> np.uint64(6)).astype(np.int64)),
+                np.left_shift(np.uint64(1), codes & np.uint64(63))
+            )
+        
+        self._row_by_identity: Dict[int, int] = {}
+        # Composite ranking scores need the full specs; only set by from_phones
+        self.scores: Optional[ColumnarScores] = None
+    
+    @classmethod
+    def from_phones(cls, phones: Sequence[PhoneDTO]) -> "ColumnarPhoneIndex":
+        index = cls(
+            [_phone_row(phone) for phone in phones],
+            [phone.brand for phone in phones],
+            [phone.features for phone in phones],
+            phones.__getitem__
+        )
+        index._row_by_identity = {id(phone): row for row, phone in enumerate(phones)}
+        index.scores = ColumnarScores(phones)
+        return index
+    
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]]) -> "ColumnarPhoneIndex":
+        """Build from raw catalog dicts; DTOs are validated lazily per returned row."""
+        cache: Dict[int, PhoneDTO] = {}
+        
+        def load(row: int) -> PhoneDTO:
+            phone = cache.get(row)
+            if phone is None:
+                phone = cache[row] = PhoneDTO(**records[row])
+            return phone
+        
+        return cls(
+            [_record_row(record) for record in records],
+            [record["brand"] for record in records],
+            [record["features"] for record in records],
+            load
+        )
+    
+    def feature_query(self, features: Iterable[str]) -> "np.ndarray":
+        query = np.zeros(self.feature_bits.shape[1], dtype=np.uint64)
+        for feature in features:
+            code = self.feature_vocab.get(feature.lower())
+            if code is not None:
+                query[code >> 6] |= np.uint64(1 << (code & 63))
+        return query
+    
+    def filter_mask(
+        self,
+        budget_min: Optional[int] = None,
+        budget_max: Optional[int] = None,
+        brand: Optional[str] = None,
+        features: Optional[List[str]] = None,
+        min_camera_mp: Optional[int] = None,
+        min_battery_mah: Optional[int] = None,
+        min_ram_gb: Optional[int] = None
+    ) -> "np.ndarray":
+        # Falsy values mean "no filter", as in the original list-based search
+        mask = np.ones(self.size, dtype=bool)
+        if budget_min:
+            mask &= self.columns["price"] >= budget_min
+        if budget_max:
+            mask &= self.columns["price"] <= budget_max
+        if brand:
+            code = self.brand_vocab.get(brand.lower())
+            if code is None:
+                return np.zeros(self.size, dtype=bool)
+            mask &= self.brand_codes == code
+        if features:
+            query = self.feature_query(features)
+            # Any-of semantics: at least one requested feature bit set
+            mask &= (self.feature_bits & query).any(axis=1)
+        if min_camera_mp:
+            mask &= self.columns["main_mp"] >= min_camera_mp
+        if min_battery_mah:
+            mask &= self.columns["battery_mah"] >= min_battery_mah
+        if min_ram_gb:
+            mask &= self.columns["ram_gb"] >= min_ram_gb
+        return mask
+    
+    def select_rows(self, mask: "np.ndarray", sort_by: Optional[str] = None, limit: Optional[int] = None) -> "np.ndarray":
+        rows = np.flatnonzero(mask)
+        if limit is not None and limit <= 0:
+            return rows[:0]
+        
+        keys = self._sort_keys(sort_by)
+        if keys is None:
+            return rows if limit is None else rows[:limit]
+        keys = keys[rows]
+        
+        k = len(rows) if limit is None else min(limit, len(rows))
+        if k < len(rows):
+            # Keep everything strictly better than the k-th key, then fill up
+            # with ties in catalog order so results match a stable sort
+            kth = np.partition(keys, k - 1)[k - 1]
+            better = keys < kth
+            ties = np.flatnonzero(keys == kth)[:k - int(better.sum())]
+            keep = np.concatenate([np.flatnonzero(better), ties])
+            rows, keys = rows[keep], keys[keep]
+        
+        order = np.lexsort((rows, keys))
+        return rows[order]
+    
+    def facet_counts(self, mask: "np.ndarray") -> Dict[str, Dict[str, int]]:
+        """Phones per facet value within ``mask``, counted with bincount over the matching rows."""
+        rows = np.flatnonzero(mask)
+        brands = np.bincount(self.brand_codes[rows], minlength=len(self.brand_labels))
+        
+        bits = self.feature_bits[rows]
+        codes = np.arange(len(self.feature_labels), dtype=np.uint64)
+        words = (codes >> np.uint64(6)).astype(np.int64)
+        features = ((bits[:, words] >> (codes & np.uint64(63))) & np.uint64(1)).sum(axis=0)
+        
+        prices = np.bincount(np.searchsorted(PRICE_EDGES, self.columns["price"][rows], side="right"), minlength=len(PRICE_LABELS))
+        counts = {
+            "brand": zip(self.brand_labels, brands.tolist()),
+            "feature": zip(self.feature_labels, features.tolist()),
+            "price": zip(PRICE_LABELS, prices.tolist()),
+        }
+        for facet in ("ram_gb", "storage_gb"):
+            values, tallies = np.unique(self.columns[facet][rows], return_counts=True)
+            counts[facet] = ((tier_label(int(value)), int(tally)) for value, tally in zip(values, tallies))
+        return {facet: ordered_counts(facet, counts[facet]) for facet in ("brand", "feature", "ram_gb", "storage_gb", "price")}
+    
+    def _sort_keys(self, sort_by: Optional[str]) -> Optional["np.ndarray"]:
+        # Ascending keys per row: negated for descending columns and composite scores
+        if sort_by in SORT_COLUMNS:
+            column, descending = SORT_COLUMNS[sort_by]
+            return -self.columns[column] if descending else self.columns[column]
+        weights = parse_weights(sort_by) if self.scores is not None else None
+        if weights is None:
+            return None
+        return -self.scores.composite(weights)
+    
+    def select(self, mask: "np.ndarray", sort_by: Optional[str] = None, limit: Optional[int] = None) -> List[PhoneDTO]:
+        return [self._row_loader(int(row)) for row in self.select_rows(mask, sort_by, limit)]
+    
+    def sort(self, phones: List[PhoneDTO], sort_by: str) -> Optional[List[PhoneDTO]]:
+        """Sort catalog phones by their column values; None if any phone is not indexed."""
+        keys = self._sort_keys(sort_by)
+        if keys is None or not self._row_by_identity:
+            return None
+        rows = [self._row_by_identity.get(id(phone)) for phone in phones]
+        if None in rows:
+            return None
+        
+        keys = keys[np.array(rows, dtype=np.int64)]
+        order = np.argsort(keys, kind="stable")
+        return [phones[position] for position in order]
+    
+    def score_breakdown(self, phone: PhoneDTO) -> Optional[Dict[str, int]]:
+        row = self._row_by_identity.get(id(phone))
+        return None if row is None or self.scores is None else dict(self.scores.breakdown(row))
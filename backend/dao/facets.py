@@ -0,0 +1,53 @@
+from bisect import bisect_right
+from typing import Callable, Dict, Iterable, List, Tuple
+from backend.dto import PhoneDTO
+
+
+FACETS = ("brand", "feature", "ram_gb", "storage_gb", "price")
+
+# Upper bounds (exclusive) of the price buckets, in INR
+PRICE_EDGES = (15000, 20000, 30000, 40000, 60000)
+PRICE_LABELS = ("<15k", "15k-20k", "20k-30k", "30k-40k", "40k-60k", "60k+")
+
+
+def price_bucket(price: int) -> str:
+    return PRICE_LABELS[bisect_right(PRICE_EDGES, price)]
+
+
+def tier_label(gb: int) -> str:
+    return f"{gb}GB"
+
+
+# Facet -> labels of one phone; a phone can be in several feature values
+FACET_VALUES: Dict[str, Callable[[PhoneDTO], Iterable[str]]] = {
+    "brand": lambda p: (p.brand,),
+    "feature": lambda p: p.features,
+    "ram_gb": lambda p: (tier_label(p.specs.ram_gb),),
+    "storage_gb": lambda p: (tier_label(p.specs.storage_gb),),
+    "price": lambda p: (price_bucket(p.price),),
+}
+
+
+def _sort_key(facet: str) -> Callable[[Tuple[str, int]], tuple]:
+    if facet == "price":
+        return lambda item: PRICE_LABELS.index(item[0])
+    if facet in ("ram_gb", "storage_gb"):
+        return lambda item: int(item[0][:-2])
+    # Most common first
+    return lambda item: (-item[1], item[0].lower())
+
+
+def ordered_counts(facet: str, counts: Iterable[Tuple[str, int]]) -> Dict[str, int]:
+    """Non-zero counts in display order: buckets and tiers ascending, brands and features by count."""
+    return dict(sorted(((label, count) for label, count in counts if count), key=_sort_key(facet)))
+
+
+def group_labels(phones: Iterable[PhoneDTO]) -> Dict[str, Dict[str, List[int]]]:
+    """Facet -> label -> rows. Labels compare case-insensitively; the first spelling seen is kept."""
+    groups: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+    spellings: Dict[str, Dict[str, str]] = {facet: {} for facet in FACETS}
+    for row, phone in enumerate(phones):
+        for facet, values in FACET_VALUES.items():
+            for value in {spellings[facet].setdefault(v.lower(), v) for v in values(phone)}:
+                groups[facet].setdefault(value, []).append(row)
+    return groups
@@ -0,0 +1,144 @@
+import math
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+from backend.dto import PhoneDTO
+
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_DIGITS = re.compile(r"\d+")
+
+
+def normalize_name(text: str) -> str:
+    """Lower-case, spell out '+' and collapse punctuation to single spaces."""
+    text = text.lower().replace("+", " plus ")
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def padded_trigrams(text: str) -> FrozenSet[str]:
+    # Padding gives word starts and ends their own trigrams, which keeps
+    # short names with a typo ("pixle 8a") similar enough to match
+    return trigrams(f" {text} ")
+
+
+class ModelNameIndex:
+    """Prebuilt index for resolving free-text model names to catalog phones.
+    
+    Matches are ranked in tiers: exact name (with or without brand, spaces
+    ignored), then the query as whole tokens inside a name, then any
+    substring, then trigram similarity. Within a tier the name the query
+    covers best wins, so "Pixel 8" resolves to the Pixel 8 rather than
+    whichever of "Pixel 8a" / "Pixel 8" comes first in the catalog.
+    """
+    
+    FUZZY_THRESHOLD = 0.5
+    
+    def __init__(self, phones: Sequence[PhoneDTO]):
+        self.phones = tuple(phones)
+        self.size = len(self.phones)
+        self._full_names: List[str] = []
+        self._model_names: List[str] = []
+        self._grams: List[FrozenSet[str]] = []
+        self._model_grams: List[FrozenSet[str]] = []
+        self._digits: List[FrozenSet[str]] = []
+        self._exact: Dict[str, int] = {}
+        
+        postings: Dict[str, set] = {}
+        for row, phone in enumerate(self.phones):
+            model = normalize_name(phone.model)
+            full = normalize_name(f"{phone.brand} {phone.model}")
+            self._model_names.append(model)
+            self._full_names.append(full)
+            
+            for name in (model, full, model.replace(" ", ""), full.replace(" ", "")):
+                self._exact.setdefault(name, row)
+            
+            self._grams.append(padded_trigrams(full))
+            self._model_grams.append(padded_trigrams(model))
+            self._digits.append(frozenset(_DIGITS.findall(full)))
+            # Padded trigrams of the full name cover the unpadded ones and the model's
+            for gram in self._grams[row]:
+                postings.setdefault(gram, set()).add(row)
+        
+        self._postings: Dict[str, FrozenSet[int]] = {gram: frozenset(rows) for gram, rows in postings.items()}
+    
+    def resolve(self, name: str) -> Optional[PhoneDTO]:
+        row = self.resolve_row(name)
+        return self.phones[row] if row is not None else None
+    
+    def resolve_row(self, name: str) -> Optional[int]:
+        query = normalize_name(name)
+        if not query:
+            return None
+        
+        row = self._exact.get(query)
+        if row is None:
+            row = self._exact.get(query.replace(" ", ""))
+        if row is None:
+            row = self._best_substring(query)
+        if row is None:
+            row = self._best_fuzzy(query)
+        return row
+    
+    def resolve_many(self, names: Iterable[str]) -> List[Optional[PhoneDTO]]:
+        resolved: Dict[str, Optional[PhoneDTO]] = {}
+        results = []
+        for name in names:
+            if name not in resolved:
+                resolved[name] = self.resolve(name)
+            results.append(resolved[name])
+        return results
+    
+    def _rarest_first(self, grams: Iterable[str]) -> List[FrozenSet[int]]:
+        return sorted((self._postings.get(gram, frozenset()) for gram in grams), key=len)
+    
+    def _candidate_rows(self, grams: FrozenSet[str]) -> Iterable[int]:
+        if not grams:
+            return range(self.size)
+        postings = self._rarest_first(grams)
+        return sorted(postings[0].intersection(*postings[1:]))
+    
+    def _best_substring(self, query: str) -> Optional[int]:
+        padded = f" {query} "
+        best: Optional[Tuple[int, float, int]] = None
+        # A substring shares every one of its trigrams with the name
+        for row in self._candidate_rows(trigrams(query)):
+            full = self._full_names[row]
+            if query not in full:
+                continue
+            whole_tokens = 1 if padded in f" {full} " else 0
+            coverage = len(query) / len(self._model_names[row] if query in self._model_names[row] else full)
+            score = (whole_tokens, coverage, -row)
+            if best is None or score > best:
+                best = score
+        return -best[2] if best is not None else None
+    
+    def _best_fuzzy(self, query: str) -> Optional[int]:
+        grams = padded_trigrams(query)
+        if not grams:
+            return None
+        
+        # Prefix filter: a name reaching the Dice threshold must share at
+        # least `needed` trigrams, so it contains one of the rarest few
+        threshold = self.FUZZY_THRESHOLD
+        needed = math.ceil(threshold * len(grams) / (2 - threshold))
+        rarest = self._rarest_first(grams)[:len(grams) - needed + 1]
+        candidates = sorted(frozenset().union(*rarest))
+        
+        # Fuzzy matching only forgives spelling: model numbers must be the
+        # same, so "iPhone 16" or "Pixel Fold" never resolve to another phone
+        query_digits = frozenset(_DIGITS.findall(query))
+        best: Optional[Tuple[float, int]] = None
+        for row in candidates:
+            if query_digits != self._digits[row]:
+                continue
+            dice = max(
+                2 * len(grams & name_grams) / (len(grams) + len(name_grams))
+                for name_grams in (self._grams[row], self._model_grams[row])
+            )
+            if dice >= threshold and (best is None or (dice, -row) > best):
+                best = (dice, -row)
+        return -best[1] if best is not None else None
@@ -1,35 +1,182 @@
-import json
-from typing import List, Optional
-from pathlib import Path
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from backend.config import settings
 from backend.dto import PhoneDTO
+from backend.dao.phone_index import PhoneIndex
+from backend.dao.catalog_snapshot import content_version, parse_phones, read_snapshot, snapshot_path
+from backend.dao.name_index import ModelNameIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PHONES_FILE = os.path.join(os.path.dirname(__file__), '../data/phones.json')
+
+
+class CatalogSnapshot:
+    """One loaded version of the catalog with every index built over it.
+    
+    Never modified after construction; a reload builds a new snapshot and
+    swaps the reference, so a reader holding one sees a consistent catalog.
+    """
+    
+    __slots__ = ("phones", "version", "loaded_at", "by_id", "index", "names", "_similar", "feature_text")
+    
+    def __init__(self, phones: List[PhoneDTO], version: str, index):
+        self.phones = phones
+        self.version = version
+        self.loaded_at = time.time()
+        self.by_id = {phone.id: phone for phone in reversed(phones)}
+        self.index = index
+        self.names = ModelNameIndex(phones)
+        self._similar = None
+        # Pre-lowercased feature text for substring lookups like "phones with OIS"
+        self.feature_text = tuple(
+            (
+                f"{phone.brand} {phone.model}",
+                tuple(f.lower() for f in phone.features),
+                tuple(cf.lower() for cf in phone.specs.camera.features)
+            )
+            for phone in phones
+        )
+    
+    @property
+    def similar(self):
+        # Built on first use (or by the warm-up); it is the costliest index and
+        # only find_similar needs it. A concurrent first use builds it twice.
+        if self._similar is None:
+            from backend.dao.similarity import SimilarityIndex
+            self._similar = SimilarityIndex(self.phones)
+        return self._similar
 
 
 class PhoneDAO:
-    def __init__(self, data_file: str = "backend/data/phones.json"):
-        self.data_file = Path(data_file)
-        self.phones: List[PhoneDTO] = []
-        self._load_data()
+    """Phone catalog served from an immutable snapshot that can be swapped at runtime.
+    
+    When the data file's mtime changes (checked at most every
+    ``reload_interval`` seconds, negative disables) a background thread
+    builds the next snapshot while requests keep using the current one.
+    ``reload()`` does the same synchronously. Caches keyed on ``version``
+    drop their entries once the new snapshot is in place. With
+    ``snapshot_file``, phones come from a precompiled snapshot (see
+    ``catalog_snapshot``) while it matches the data file's content.
+    """
+    
+    def __init__(self, data_file: str = DEFAULT_PHONES_FILE, reload_interval: float = -1, snapshot_file: Optional[str] = None):
+        self.data_file = data_file
+        self.snapshot_file = snapshot_file
+        self.reload_interval = reload_interval
+        self.reloads = 0
+        self.reload_errors = 0
+        self._last_check = time.monotonic()
+        self._check_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._reloading = False
+        self._snapshot, self._mtime = self._load_snapshot()
+    
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        self._maybe_reload()
+        return self._snapshot
+    
+    @property
+    def phones(self) -> List[PhoneDTO]:
+        return self.snapshot.phones
+    
+    @property
+    def version(self) -> str:
+        return self.snapshot.version
     
-    def _load_data(self):
-        with open(self.data_file, 'r') as f:
-            data = json.load(f)
-            self.phones = [PhoneDTO(**phone) for phone in data['phones']]
+    def _load_snapshot(self) -> Tuple[CatalogSnapshot, float]:
+        mtime = os.path.getmtime(self.data_file)
+        with open(self.data_file, 'rb') as f:
+            raw = f.read()
+        version = content_version(raw)
+        phones = read_snapshot(self.snapshot_file, version) if self.snapshot_file else None
+        if phones is None:
+            phones = parse_phones(raw)
+        return CatalogSnapshot(phones, version, self._build_index(phones)), mtime
+    
+    def _build_index(self, phones: List[PhoneDTO]):
+        if settings.catalog_backend == "columnar":
+            # NumPy is imported only when this backend is selected
+            from backend.dao.columnar import ColumnarPhoneIndex, numpy_available
+            if numpy_available():
+                return ColumnarPhoneIndex.from_phones(phones)
+            logger.warning("catalog_backend=columnar needs numpy; falling back to the bitset index")
+        return PhoneIndex(phones)
+    
+    def reload(self) -> Tuple[str, str]:
+        """Load the data file now and swap it in if its content changed.
+        
+        Returns ``(previous_version, current_version)``. Raises if the file
+        cannot be read or parsed, leaving the current snapshot in place.
+        """
+        with self._reload_lock:
+            previous = self._snapshot
+            snapshot, self._mtime = self._load_snapshot()
+            if snapshot.version == previous.version:
+                # Touched but unchanged; keep the snapshot callers already hold
+                return previous.version, previous.version
+            self._snapshot = snapshot
+            self.reloads += 1
+        logger.info(f"Catalog reloaded: {previous.version} -> {snapshot.version} ({len(snapshot.phones)} phones)")
+        return previous.version, snapshot.version
+    
+    def _maybe_reload(self):
+        if self.reload_interval < 0:
+            return
+        
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        
+        with self._check_lock:
+            if now - self._last_check < self.reload_interval or self._reloading:
+                return
+            self._last_check = now
+            try:
+                mtime = os.path.getmtime(self.data_file)
+            except OSError:
+                return
+            if mtime == self._mtime:
+                return
+            # A file that fails to load is retried only after it changes again
+            self._mtime = mtime
+            self._reloading = True
+        threading.Thread(target=self._reload_in_background, name="catalog-reload", daemon=True).start()
+    
+    def _reload_in_background(self):
+        try:
+            self.reload()
+        except Exception as e:
+            self.reload_errors += 1
+            logger.error(f"Catalog reload failed, keeping version {self._snapshot.version}: {e}", exc_info=True)
+        finally:
+            self._reloading = False
+    
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version,
+            "phones": len(snapshot.phones),
+            "loaded_at": snapshot.loaded_at,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors
+        }
     
     def get_all(self) -> List[PhoneDTO]:
-        return self.phones
+        return self.snapshot.phones
     
     def get_by_id(self, phone_id: int) -> Optional[PhoneDTO]:
-        for phone in self.phones:
-            if phone.id == phone_id:
-                return phone
-        return None
+        return self.snapshot.by_id.get(phone_id)
     
     def get_by_model(self, model: str) -> Optional[PhoneDTO]:
-        model_lower = model.lower()
-        for phone in self.phones:
-            if model_lower in phone.model.lower() or model_lower in f"{phone.brand} {phone.model}".lower():
-                return phone
-        return None
+        return self.snapshot.names.resolve(model)
+    
+    def get_by_models(self, models: List[str]) -> List[Optional[PhoneDTO]]:
+        return self.snapshot.names.resolve_many(models)
     
     def search(
         self,
@@ -39,39 +186,53 @@ class PhoneDAO:
         features: Optional[List[str]] = None,
         min_camera_mp: Optional[int] = None,
         min_battery_mah: Optional[int] = None,
-        min_ram_gb: Optional[int] = None
+        min_ram_gb: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        limit: Optional[int] = None
     ) -> List[PhoneDTO]:
-        results = self.phones
-        
-        if budget_min:
-            results = [p for p in results if p.price >= budget_min]
-        
-        if budget_max:
-            results = [p for p in results if p.price <= budget_max]
-        
-        if brand:
-            brand_lower = brand.lower()
-            results = [p for p in results if p.brand.lower() == brand_lower]
-        
-        if features:
-            features_lower = [f.lower() for f in features]
-            results = [
-                p for p in results 
-                if any(f in [pf.lower() for pf in p.features] for f in features_lower)
-            ]
-        
-        if min_camera_mp:
-            results = [p for p in results if p.specs.camera.main_mp >= min_camera_mp]
-        
-        if min_battery_mah:
-            results = [p for p in results if p.specs.battery_mah >= min_battery_mah]
-        
-        if min_ram_gb:
-            results = [p for p in results if p.specs.ram_gb >= min_ram_gb]
-        
-        return results
+        index = self.snapshot.index
+        mask = index.filter_mask(
+            budget_min=budget_min,
+            budget_max=budget_max,
+            brand=brand,
+            features=features,
+            min_camera_mp=min_camera_mp,
+            min_battery_mah=min_battery_mah,
+            min_ram_gb=min_ram_gb
+        )
+        return index.select(mask, sort_by=sort_by, limit=limit)
+    
+    def facets(
+        self,
+        budget_min: Optional[int] = None,
+        budget_max: Optional[int] = None,
+        brand: Optional[str] = None,
+        features: Optional[List[str]] = None,
+        min_camera_mp: Optional[int] = None,
+        min_battery_mah: Optional[int] = None,
+        min_ram_gb: Optional[int] = None
+    ) -> dict:
+        """Match count plus per-brand, feature, RAM, storage and price bucket counts for the same filters as search()."""
+        index = self.snapshot.index
+        mask = index.filter_mask(
+            budget_min=budget_min,
+            budget_max=budget_max,
+            brand=brand,
+            features=features,
+            min_camera_mp=min_camera_mp,
+            min_battery_mah=min_battery_mah,
+            min_ram_gb=min_ram_gb
+        )
+        counts = index.facet_counts(mask)
+        return {"total": sum(counts["price"].values()), "facets": counts}
     
     def sort_phones(self, phones: List[PhoneDTO], sort_by: str = "price") -> List[PhoneDTO]:
+        # Phones from an older snapshot are unknown to the current index and
+        # fall through to the plain sorts below
+        indexed = self.snapshot.index.sort(phones, sort_by)
+        if indexed is not None:
+            return indexed
+        
         if sort_by == "price":
             return sorted(phones, key=lambda p: p.price)
         elif sort_by == "camera":
@@ -84,11 +245,49 @@ class PhoneDAO:
             return sorted(phones, key=lambda p: p.price, reverse=True)
         return phones
     
+    def find_similar(
+        self,
+        model: str,
+        limit: int = 5,
+        budget_min: Optional[int] = None,
+        budget_max: Optional[int] = None,
+        brand: Optional[str] = None,
+        cheaper: bool = False
+    ) -> Tuple[Optional[PhoneDTO], List[Tuple[PhoneDTO, float]]]:
+        """The phone ``model`` resolves to, and its nearest neighbours with cosine similarity.
+        
+        ``cheaper`` caps prices below the reference phone's, resolved against
+        the same snapshot as the neighbours.
+        """
+        snapshot = self.snapshot
+        row = snapshot.names.resolve_row(model)
+        if row is None:
+            return None, []
+        if cheaper:
+            below = snapshot.phones[row].price - 1
+            budget_max = min(budget_max, below) if budget_max else below
+        neighbours = snapshot.similar.similar(row, limit, min_price=budget_min, max_price=budget_max, brand=brand)
+        return snapshot.phones[row], [(snapshot.phones[other], score) for other, score in neighbours]
+    
+    def score_breakdown(self, phone: PhoneDTO) -> Optional[Dict[str, int]]:
+        """0-100 ranking scores per criterion (camera, battery, performance, display, value)."""
+        return self.snapshot.index.score_breakdown(phone)
+    
+    def phones_with_feature(self, feature: str, limit: int = 5) -> List[str]:
+        feature_lower = feature.lower()
+        matching_phones = []
+        for name, features, camera_features in self.snapshot.feature_text:
+            if any(feature_lower in f for f in features) or any(feature_lower in cf for cf in camera_features):
+                matching_phones.append(name)
+                if len(matching_phones) == limit:
+                    break
+        return matching_phones
+    
     def compare_phones(self, phone_ids: List[int]) -> List[PhoneDTO]:
-        return [phone for phone in self.phones if phone.id in phone_ids]
-
-
-phone_dao = PhoneDAO()
-
+        return [phone for phone in self.snapshot.phones if phone.id in phone_ids]
 
 
+phone_dao = PhoneDAO(
+    reload_interval=settings.catalog_reload_interval_seconds,
+    snapshot_file=snapshot_path(DEFAULT_PHONES_FILE) if settings.catalog_snapshot_enabled else None
+)
@@ -0,0 +1,214 @@
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from backend.dto import PhoneDTO
+from backend.dao.facets import group_labels, ordered_counts
+from backend.dao.ranking import PhoneScores, parse_weights
+
+
+# sort_by -> (key, reverse), matching PhoneDAO.sort_phones
+SORT_KEYS: Dict[str, Tuple[Callable[[PhoneDTO], int], bool]] = {
+    "price": (lambda p: p.price, False),
+    "camera": (lambda p: p.specs.camera.main_mp, True),
+    "battery": (lambda p: p.specs.battery_mah, True),
+    "performance": (lambda p: p.specs.ram_gb, True),
+    "price_desc": (lambda p: p.price, True),
+}
+
+RANGE_FIELDS: Dict[str, Callable[[PhoneDTO], int]] = {
+    "price": lambda p: p.price,
+    "camera_mp": lambda p: p.specs.camera.main_mp,
+    "battery_mah": lambda p: p.specs.battery_mah,
+    "ram_gb": lambda p: p.specs.ram_gb,
+}
+
+
+def mask_from_rows(rows: Iterable[int], size: int) -> int:
+    buf = bytearray((size + 7) // 8)
+    for row in rows:
+        buf[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(buf, "little")
+
+
+def iter_rows(mask: int) -> Iterator[int]:
+    """Yield the set bit positions of ``mask`` in ascending order."""
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    for byte_index, byte in enumerate(data):
+        base = byte_index << 3
+        while byte:
+            low = byte & -byte
+            yield base + low.bit_length() - 1
+            byte ^= low
+
+
+class PhoneIndex:
+    """Read-only secondary indexes over a phone list.
+    
+    Row sets are plain ints used as bitsets, where bit ``i`` stands for
+    ``phones[i]``, so combining filters is a handful of ``&`` operations.
+    """
+    
+    RANGE_CACHE_SIZE = 256
+    
+    def __init__(self, phones: Sequence[PhoneDTO]):
+        self.phones: Tuple[PhoneDTO, ...] = tuple(phones)
+        self.size = len(self.phones)
+        self.all_rows = (1 << self.size) - 1
+        self._row_by_identity = {id(phone): row for row, phone in enumerate(self.phones)}
+        
+        # Range fields: values sorted ascending alongside the rows they came from
+        self._ranges: Dict[str, Tuple[List[int], List[int]]] = {}
+        for field, key in RANGE_FIELDS.items():
+            order = sorted(range(self.size), key=lambda row: key(self.phones[row]))
+            self._ranges[field] = ([key(self.phones[row]) for row in order], order)
+        self._range_cache: "OrderedDict[Tuple[str, Optional[int], Optional[int]], int]" = OrderedDict()
+        # Tool calls run in worker threads and share the index
+        self._range_lock = threading.Lock()
+        
+        brand_rows: Dict[str, List[int]] = {}
+        feature_rows: Dict[str, List[int]] = {}
+        for row, phone in enumerate(self.phones):
+            brand_rows.setdefault(phone.brand.lower(), []).append(row)
+            for feature in {f.lower() for f in phone.features}:
+                feature_rows.setdefault(feature, []).append(row)
+        self._brands = {brand: mask_from_rows(rows, self.size) for brand, rows in brand_rows.items()}
+        self._features = {feature: mask_from_rows(rows, self.size) for feature, rows in feature_rows.items()}
+        self._facets = {
+            facet: {label: mask_from_rows(rows, self.size) for label, rows in labels.items()}
+            for facet, labels in group_labels(self.phones).items()
+        }
+        
+        # Presorted orderings; sorted() is stable, so any filtered subset taken
+        # in this order matches sorting that subset directly
+        self._orderings: Dict[str, List[int]] = {}
+        self._ranks: Dict[str, List[int]] = {}
+        self._sort_values: Dict[str, List[int]] = {}
+        for sort_by, (key, reverse) in SORT_KEYS.items():
+            values = [key(phone) for phone in self.phones]
+            order = sorted(range(self.size), key=values.__getitem__, reverse=reverse)
+            ranks = [0] * self.size
+            for rank, row in enumerate(order):
+                ranks[row] = rank
+            self._orderings[sort_by] = order
+            self._ranks[sort_by] = ranks
+            self._sort_values[sort_by] = values
+        
+        self.scores = PhoneScores(self.phones)
+    
+    def range_mask(self, field: str, low: Optional[int] = None, high: Optional[int] = None) -> int:
+        cache_key = (field, low, high)
+        with self._range_lock:
+            mask = self._range_cache.get(cache_key)
+            if mask is not None:
+                self._range_cache.move_to_end(cache_key)
+                return mask
+        
+        values, order = self._ranges[field]
+        start = bisect_left(values, low) if low is not None else 0
+        end = bisect_right(values, high) if high is not None else self.size
+        mask = mask_from_rows(order[start:end], self.size)
+        
+        with self._range_lock:
+            self._range_cache[cache_key] = mask
+            while len(self._range_cache) > self.RANGE_CACHE_SIZE:
+                self._range_cache.popitem(last=False)
+        return mask
+    
+    def brand_mask(self, brand: str) -> int:
+        return self._brands.get(brand.lower(), 0)
+    
+    def feature_mask(self, features: Iterable[str]) -> int:
+        # A phone matches if it has any of the requested features
+        mask = 0
+        for feature in features:
+            mask |= self._features.get(feature.lower(), 0)
+        return mask
+    
+    def filter_mask(
+        self,
+        budget_min: Optional[int] = None,
+        budget_max: Optional[int] = None,
+        brand: Optional[str] = None,
+        features: Optional[List[str]] = None,
+        min_camera_mp: Optional[int] = None,
+        min_battery_mah: Optional[int] = None,
+        min_ram_gb: Optional[int] = None
+    ) -> int:
+        # Falsy values mean "no filter", as in the original list-based search
+        mask = self.all_rows
+        if budget_min or budget_max:
+            mask &= self.range_mask("price", budget_min or None, budget_max or None)
+        if brand:
+            mask &= self.brand_mask(brand)
+        if features:
+            mask &= self.feature_mask(features)
+        if min_camera_mp:
+            mask &= self.range_mask("camera_mp", min_camera_mp)
+        if min_battery_mah:
+            mask &= self.range_mask("battery_mah", min_battery_mah)
+        if min_ram_gb:
+            mask &= self.range_mask("ram_gb", min_ram_gb)
+        return mask
+    
+    def facet_counts(self, mask: int) -> Dict[str, Dict[str, int]]:
+        """Phones per facet value within ``mask``: one AND and popcount per value."""
+        return {
+            facet: ordered_counts(facet, ((label, (mask & value_mask).bit_count()) for label, value_mask in values.items()))
+            for facet, values in self._facets.items()
+        }
+    
+    def select(self, mask: int, sort_by: Optional[str] = None, limit: Optional[int] = None) -> List[PhoneDTO]:
+        if limit is not None and limit <= 0:
+            return []
+        
+        if sort_by not in self._orderings:
+            weights = parse_weights(sort_by)
+            if weights is not None:
+                return [self.phones[row] for row in self.scores.top_rows(iter_rows(mask), weights, limit)]
+            rows: Iterable[int] = iter_rows(mask)
+            if limit is not None:
+                rows = (row for row, _ in zip(rows, range(limit)))
+            return [self.phones[row] for row in rows]
+        
+        count = mask.bit_count()
+        k = count if limit is None else min(limit, count)
+        
+        if count * 8 < self.size or k == count:
+            # Sparse result (or everything wanted): rank the matches directly
+            ranks = self._ranks[sort_by]
+            rows = list(iter_rows(mask))
+            if k < count:
+                rows = heapq.nsmallest(k, rows, key=ranks.__getitem__)
+            else:
+                rows.sort(key=ranks.__getitem__)
+            return [self.phones[row] for row in rows]
+        
+        # Dense result: walk the presorted order until k matches are found
+        bits = mask.to_bytes((self.size + 7) // 8, "little")
+        selected = []
+        for row in self._orderings[sort_by]:
+            if bits[row >> 3] >> (row & 7) & 1:
+                selected.append(self.phones[row])
+                if len(selected) == k:
+                    break
+        return selected
+    
+    def sort(self, phones: List[PhoneDTO], sort_by: str) -> Optional[List[PhoneDTO]]:
+        """Sort catalog phones by precomputed key values; None if any phone is not indexed."""
+        values = self._sort_values.get(sort_by)
+        weights = parse_weights(sort_by) if values is None else None
+        if values is None and weights is None:
+            return None
+        rows = [self._row_by_identity.get(id(phone)) for phone in phones]
+        if None in rows:
+            return None
+        if weights is not None:
+            return [self.phones[row] for row in self.scores.top_rows(rows, weights)]
+        rows.sort(key=values.__getitem__, reverse=SORT_KEYS[sort_by][1])
+        return [self.phones[row] for row in rows]
+    
+    def score_breakdown(self, phone: PhoneDTO) -> Optional[Dict[str, int]]:
+        row = self._row_by_identity.get(id(phone))
+        return None if row is None else dict(self.scores.breakdown(row))
@@ -0,0 +1,144 @@
+import heapq
+import math
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from backend.dto import PhoneDTO
+
+
+# Rough relative CPU/GPU tier (flagship ~95, entry level ~20), keyed by
+# lower-cased chipset name without the vendor prefix
+PROCESSOR_SCORES: Dict[str, float] = {
+    "a16 bionic": 95, "a15 bionic": 88,
+    "snapdragon 8 gen 2": 95, "snapdragon 8s gen 3": 90, "snapdragon 8+ gen 1": 88, "snapdragon 888+": 80,
+    "snapdragon 7+ gen 2": 80, "snapdragon 7 gen 3": 64, "snapdragon 782g": 60, "snapdragon 778g": 58,
+    "snapdragon 7s gen 2": 55, "snapdragon 695": 40, "snapdragon 4 gen 2": 33, "snapdragon 685": 28,
+    "dimensity 9000": 85, "dimensity 8300 ultra": 82, "dimensity 8020": 66, "dimensity 7200 ultra": 59,
+    "dimensity 7200 pro": 58, "dimensity 7200": 58, "dimensity 1080": 52, "dimensity 7050": 50,
+    "dimensity 900": 48, "dimensity 930": 45, "dimensity 7020": 40,
+    "helio g88": 20, "helio g85": 18,
+    "google tensor g3": 80,
+    "exynos 2200": 78, "exynos 1380": 50, "exynos 1280": 40, "exynos 1330": 38, "exynos 850": 18,
+}
+UNKNOWN_PROCESSOR_SCORE = 45.0
+
+CRITERIA = ("camera", "battery", "performance", "display", "value")
+
+# Named composite sorts; weights are relative
+PRESETS: Dict[str, Dict[str, float]] = {
+    "balanced": {"camera": 1, "battery": 1, "performance": 1, "display": 1},
+    "value": {"value": 1},
+    "gaming": {"performance": 3, "display": 1, "battery": 1},
+    "photography": {"camera": 3, "display": 1, "performance": 1},
+}
+
+_VENDOR_PREFIX = re.compile(r"^(?:mediatek|qualcomm|samsung|apple)\s+")
+_WEIGHT_TERM = re.compile(r"^\s*([a-z_]+)\s*(?::\s*(\d+(?:\.\d+)?))?\s*$")
+
+
+def processor_score(processor: str) -> float:
+    return PROCESSOR_SCORES.get(_VENDOR_PREFIX.sub("", processor.strip().lower()), UNKNOWN_PROCESSOR_SCORE)
+
+
+@lru_cache(maxsize=256)
+def parse_weights(sort_by: Optional[str]) -> Optional[Tuple[Tuple[str, float], ...]]:
+    """``"balanced"`` or ``"camera:2,battery:1"`` -> normalized (criterion, weight) pairs.
+    
+    None if ``sort_by`` is not a composite sort (plain keys such as
+    ``"camera"`` keep their single-spec meaning).
+    """
+    if not sort_by:
+        return None
+    text = sort_by.strip().lower()
+    if text in PRESETS:
+        weights = dict(PRESETS[text])
+    elif ":" in text or "," in text or "+" in text:
+        weights = {}
+        for term in re.split(r"[,+]", text):
+            match = _WEIGHT_TERM.match(term)
+            if not match or match.group(1) not in CRITERIA:
+                return None
+            weights[match.group(1)] = weights.get(match.group(1), 0) + float(match.group(2) or 1)
+    else:
+        return None
+    
+    total = sum(weights.values())
+    if total <= 0:
+        return None
+    return tuple(sorted((name, weight / total) for name, weight in weights.items() if weight > 0))
+
+
+def _raw_scores(phone: PhoneDTO) -> Tuple[float, float, float, float]:
+    specs = phone.specs
+    camera_features = {f.lower() for f in specs.camera.features}
+    camera = (
+        math.log2(max(specs.camera.main_mp, 1))
+        + (1.0 if specs.camera.ultrawide_mp else 0.0)
+        + (1.0 if "ois" in camera_features else 0.0)
+        + 0.5 * len(camera_features)
+    )
+    battery = specs.battery_mah / 1000 + specs.fast_charging_w / 40
+    performance = processor_score(specs.processor) + 2 * specs.ram_gb
+    display = specs.refresh_rate_hz / 30 + specs.display_inches
+    return camera, battery, performance, display
+
+
+def _normalize(values: Sequence[float]) -> List[float]:
+    low, high = min(values, default=0.0), max(values, default=0.0)
+    if high == low:
+        return [1.0] * len(values)
+    return [(value - low) / (high - low) for value in values]
+
+
+class PhoneScores:
+    """Per-phone 0-1 scores for each criterion, computed once per catalog.
+    
+    camera, battery, performance and display are min-max normalized over
+    the catalog; value is their mean divided by price, normalized the same
+    way. Composite sorts are weighted sums of these columns.
+    """
+    
+    COMPOSITE_CACHE_SIZE = 64
+    
+    def __init__(self, phones: Sequence[PhoneDTO]):
+        raw = [_raw_scores(phone) for phone in phones]
+        self.columns: Dict[str, List[float]] = {
+            name: _normalize([row[position] for row in raw])
+            for position, name in enumerate(CRITERIA[:4])
+        }
+        quality = [sum(column[row] for column in self.columns.values()) / 4 for row in range(len(phones))]
+        self.columns["value"] = _normalize([score / max(phone.price, 1) for score, phone in zip(quality, phones)])
+        self._composites: "OrderedDict[tuple, Sequence[float]]" = OrderedDict()
+        # Shared by the tool calls running in worker threads
+        self._composites_lock = threading.Lock()
+    
+    def composite(self, weights: Tuple[Tuple[str, float], ...]) -> Sequence[float]:
+        with self._composites_lock:
+            scores = self._composites.get(weights)
+            if scores is not None:
+                self._composites.move_to_end(weights)
+                return scores
+        
+        scores = self._weighted_sum(weights)
+        with self._composites_lock:
+            self._composites[weights] = scores
+            while len(self._composites) > self.COMPOSITE_CACHE_SIZE:
+                self._composites.popitem(last=False)
+        return scores
+    
+    def _weighted_sum(self, weights: Tuple[Tuple[str, float], ...]) -> Sequence[float]:
+        columns = [(self.columns[name], weight) for name, weight in weights]
+        return [sum(column[row] * weight for column, weight in columns) for row in range(len(self.columns["value"]))]
+    
+    def top_rows(self, rows: Iterable[int], weights: Tuple[Tuple[str, float], ...], k: Optional[int] = None) -> List[int]:
+        """Best rows first (ties in catalog order); only the top ``k`` are fully sorted."""
+        scores = self.composite(weights)
+        key = lambda row: (-scores[row], row)
+        if k is None:
+            return sorted(rows, key=key)
+        return heapq.nsmallest(k, rows, key=key)
+    
+    def breakdown(self, row: int) -> Mapping[str, int]:
+        return {name: round(column[row] * 100) for name, column in self.columns.items()}
@@ -0,0 +1,177 @@
+import heapq
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from backend.dto import PhoneDTO
+from backend.dao.ranking import processor_score
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the pure-Python path handles small catalogs
+    np = None
+
+
+# Spec -> relative weight in the similarity vector. Price is deliberately
+# left out: "like X but cheaper" is a constraint, not a dimension.
+NUMERIC_WEIGHTS: Dict[str, Tuple[Callable[[PhoneDTO], float], float]] = {
+    "performance": (lambda p: processor_score(p.specs.processor), 1.5),
+    "camera_mp": (lambda p: math.log2(max(p.specs.camera.main_mp, 1)), 1.0),
+    "ultrawide": (lambda p: 1.0 if p.specs.camera.ultrawide_mp else 0.0, 0.5),
+    "battery_mah": (lambda p: p.specs.battery_mah, 1.0),
+    "charging_w": (lambda p: p.specs.fast_charging_w, 0.5),
+    "ram_gb": (lambda p: p.specs.ram_gb, 1.0),
+    "storage_gb": (lambda p: math.log2(max(p.specs.storage_gb, 1)), 0.5),
+    "display_inches": (lambda p: p.specs.display_inches, 1.0),
+    "refresh_rate_hz": (lambda p: p.specs.refresh_rate_hz, 0.75),
+    "weight_g": (lambda p: p.specs.weight_g, 0.5),
+}
+FEATURE_WEIGHT = 0.35
+BRAND_WEIGHT = 0.5
+
+# Up to this many phones, each phone's nearest PRECOMPUTE_NEIGHBOURS are
+# computed once (fewer without numpy, where that costs O(n^2) Python dot
+# products). Queries whose filters skip past that list score on demand.
+PRECOMPUTE_MAX_ROWS = 1000
+PRECOMPUTE_MAX_ROWS_PURE_PYTHON = 300
+PRECOMPUTE_NEIGHBOURS = 50
+
+
+def _vectors(phones: Sequence[PhoneDTO]) -> List[List[float]]:
+    columns = []
+    for key, weight in NUMERIC_WEIGHTS.values():
+        values = [float(key(phone)) for phone in phones]
+        mean = sum(values) / len(values)
+        spread = math.sqrt(sum((value - mean) ** 2 for value in values) / len(values)) or 1.0
+        columns.append([(value - mean) / spread * weight for value in values])
+    
+    vocabulary: Dict[str, int] = {}
+    for phone in phones:
+        for name in (*phone.features, *phone.specs.camera.features):
+            vocabulary.setdefault(name.lower(), len(vocabulary))
+    brands: Dict[str, int] = {}
+    for phone in phones:
+        brands.setdefault(phone.brand.lower(), len(brands))
+    
+    vectors = []
+    for row, phone in enumerate(phones):
+        vector = [column[row] for column in columns] + [0.0] * (len(vocabulary) + len(brands))
+        for name in (*phone.features, *phone.specs.camera.features):
+            vector[len(columns) + vocabulary[name.lower()]] = FEATURE_WEIGHT
+        vector[len(columns) + len(vocabulary) + brands[phone.brand.lower()]] = BRAND_WEIGHT
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        vectors.append([value / norm for value in vector])
+    return vectors
+
+
+def _matrix(phones: Sequence[PhoneDTO]) -> "np.ndarray":
+    # Same vectors as _vectors, built column-wise
+    weights = np.array([weight for _, weight in NUMERIC_WEIGHTS.values()])
+    numeric = np.array([[float(key(phone)) for key, _ in NUMERIC_WEIGHTS.values()] for phone in phones])
+    spread = numeric.std(axis=0)
+    spread[spread == 0] = 1.0
+    numeric = (numeric - numeric.mean(axis=0)) / spread * weights
+    
+    vocabulary: Dict[str, int] = {}
+    brands: Dict[str, int] = {}
+    feature_rows: List[int] = []
+    feature_codes: List[int] = []
+    for row, phone in enumerate(phones):
+        for name in (*phone.features, *phone.specs.camera.features):
+            feature_rows.append(row)
+            feature_codes.append(vocabulary.setdefault(name.lower(), len(vocabulary)))
+    brand_codes = [brands.setdefault(phone.brand.lower(), len(brands)) for phone in phones]
+    
+    columns = numeric.shape[1]
+    matrix = np.zeros((len(phones), columns + len(vocabulary) + len(brands)))
+    matrix[:, :columns] = numeric
+    matrix[feature_rows, np.array(feature_codes, dtype=np.int64) + columns] = FEATURE_WEIGHT
+    matrix[np.arange(len(phones)), np.array(brand_codes, dtype=np.int64) + columns + len(vocabulary)] = BRAND_WEIGHT
+    norms = np.linalg.norm(matrix, axis=1)
+    norms[norms == 0] = 1.0
+    return (matrix / norms[:, None]).astype(np.float32)
+
+
+class SimilarityIndex:
+    """Nearest neighbours by cosine similarity over standardized spec and feature vectors.
+    
+    Small catalogs get each phone's nearest neighbours precomputed, so a
+    query is usually a filtered walk down a short list. Larger catalogs, and
+    filters that leave too few of those neighbours, score candidates on
+    demand, with one matrix-vector product when numpy is available.
+    """
+    
+    def __init__(self, phones: Sequence[PhoneDTO]):
+        self.phones = tuple(phones)
+        self.size = len(self.phones)
+        self._vectors: List[List[float]] = []
+        self._matrix = None
+        if np is not None and self.phones:
+            self._matrix = _matrix(self.phones)
+            self._prices = np.array([phone.price for phone in self.phones], dtype=np.int64)
+            self._brands = np.array([phone.brand.lower() for phone in self.phones])
+        elif self.phones:
+            self._vectors = _vectors(self.phones)
+        self._neighbours: Optional[List[List[Tuple[int, float]]]] = None
+        if 0 < self.size <= (PRECOMPUTE_MAX_ROWS if self._matrix is not None else PRECOMPUTE_MAX_ROWS_PURE_PYTHON):
+            self._neighbours = [self._rank(row, range(self.size), PRECOMPUTE_NEIGHBOURS) for row in range(self.size)]
+    
+    def similar(
+        self,
+        row: int,
+        k: int = 5,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        brand: Optional[str] = None
+    ) -> List[Tuple[int, float]]:
+        """Up to ``k`` (row, similarity) pairs closest to ``row``, best first, excluding itself."""
+        brand = brand.lower() if brand else None
+        
+        def accept(phone: PhoneDTO) -> bool:
+            return (
+                (min_price is None or phone.price >= min_price)
+                and (max_price is None or phone.price <= max_price)
+                and (brand is None or phone.brand.lower() == brand)
+            )
+        
+        if self._neighbours is not None:
+            found = []
+            neighbours = self._neighbours[row]
+            for other, score in neighbours:
+                if accept(self.phones[other]):
+                    found.append((other, score))
+                    if len(found) == k:
+                        return found
+            if len(neighbours) < PRECOMPUTE_NEIGHBOURS:
+                # The list holds every other phone
+                return found
+        
+        if self._matrix is not None:
+            mask = np.ones(self.size, dtype=bool)
+            if min_price is not None:
+                mask &= self._prices >= min_price
+            if max_price is not None:
+                mask &= self._prices <= max_price
+            if brand is not None:
+                mask &= self._brands == brand
+            return self._rank(row, np.flatnonzero(mask), k)
+        return self._rank(row, [other for other in range(self.size) if accept(self.phones[other])], k)
+    
+    def _rank(self, row: int, candidates, k: Optional[int] = None) -> List[Tuple[int, float]]:
+        if self._matrix is not None:
+            rows = np.asarray(candidates, dtype=np.int64)
+            rows = rows[rows != row]
+            scores = self._matrix[rows] @ self._matrix[row]
+            if k is not None and k < len(rows):
+                # Keep everything tied with the k-th score so ties go to the lowest row
+                keep = -scores <= np.partition(-scores, k - 1)[k - 1]
+                rows, scores = rows[keep], scores[keep]
+            order = np.lexsort((rows, -scores))[:k]
+            return [(int(rows[i]), float(scores[i])) for i in order]
+        
+        query = self._vectors[row]
+        scored = [
+            (sum(a * b for a, b in zip(query, self._vectors[other])), other)
+            for other in candidates if other != row
+        ]
+        key = lambda item: (-item[0], item[1])
+        best = sorted(scored, key=key) if k is None else heapq.nsmallest(k, scored, key=key)
+        return [(other, score) for score, other in best]
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+from backend.config import settings
+from backend.dao.phone_dao import PhoneDAO, phone_dao
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TERMS_FILE = os.path.join(os.path.dirname(__file__), '../data/technical_terms.json')
+
+
+class TechnicalTermsDAO:
+    """Technical terms loaded once into a read-only lookup, reloaded when the file's mtime changes.
+    
+    The mtime is checked at most every ``reload_interval`` seconds, so lookups
+    are plain dictionary reads; a negative interval disables reloading.
+    """
+    
+    def __init__(self, phone_dao: PhoneDAO, data_file: str = DEFAULT_TERMS_FILE, reload_interval: float = 5.0):
+        self.phone_dao = phone_dao
+        self.data_file = data_file
+        self.reload_interval = reload_interval
+        self._examples: Dict[str, List[str]] = {}
+        self._examples_catalog = None
+        self._terms: Mapping[str, Mapping] = MappingProxyType({})
+        self._available_terms: List[str] = []
+        self._mtime: Optional[float] = None
+        self.version = ""
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._load()
+        self._build_examples()
+    
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.data_file)
+            with open(self.data_file, 'rb') as f:
+                raw = f.read()
+            terms_data = json.loads(raw)
+        except Exception as e:
+            logger.error(f"Error loading technical terms: {e}", exc_info=True)
+            return
+        
+        # Create lookup dictionary
+        terms_dict = {}
+        for term_info in terms_data:
+            term_info = MappingProxyType(term_info)
+            term_key = term_info['term'].lower()
+            terms_dict[term_key] = term_info
+            # Also add full name as key
+            if term_info.get('full_name'):
+                terms_dict[term_info['full_name'].lower()] = term_info
+        
+        self._terms = MappingProxyType(terms_dict)
+        self._available_terms = sorted(set(t['term'] for t in terms_dict.values() if 'term' in t))
+        self._mtime = mtime
+        self.version = hashlib.sha1(raw).hexdigest()[:12]
+        self._examples_catalog = None
+    
+    def _build_examples(self, limit: int = 5):
+        # One pass over the catalog for every term at once, stopping when each
+        # has its examples; same matches and order as phones_with_feature
+        snapshot = self.phone_dao.snapshot
+        examples: Dict[str, List[str]] = {key: [] for key in self._terms}
+        pending = list(examples)
+        for name, features, camera_features in snapshot.feature_text:
+            if not pending:
+                break
+            # No term contains NUL, so a match never spans two features
+            text = "\0".join(features + camera_features)
+            filled = False
+            for key in pending:
+                if key in text:
+                    examples[key].append(name)
+                    filled = filled or len(examples[key]) == limit
+            if filled:
+                pending = [key for key in pending if len(examples[key]) < limit]
+        self._examples = examples
+        self._examples_catalog = snapshot.phones
+    
+    def _maybe_reload(self):
+        if self.reload_interval < 0:
+            return
+        
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        
+        with self._lock:
+            if now - self._last_check < self.reload_interval:
+                return
+            self._last_check = now
+            try:
+                mtime = os.path.getmtime(self.data_file)
+            except OSError:
+                return
+            if mtime != self._mtime:
+                self._load()
+    
+    def get_all(self) -> Mapping[str, Mapping]:
+        self._maybe_reload()
+        return self._terms
+    
+    def get(self, term: str) -> Optional[Mapping]:
+        return self.get_all().get(term.lower().strip())
+    
+    def available_terms(self) -> List[str]:
+        self._maybe_reload()
+        return self._available_terms
+    
+    def example_phones(self, term: str) -> List[str]:
+        """Up to 5 catalog phones whose features mention ``term``.
+        
+        Examples for every known term are collected in one pass over the
+        catalog per load, so the tool loop only does a dictionary lookup.
+        """
+        self._maybe_reload()
+        if self._examples_catalog is not self.phone_dao.get_all():
+            self._build_examples()
+        
+        examples = self._examples.get(term.lower())
+        if examples is None:
+            examples = self.phone_dao.phones_with_feature(term)
+        return examples
+
+
+technical_terms_dao = TechnicalTermsDAO(phone_dao, reload_interval=settings.technical_terms_reload_interval_seconds)
@@ -5,7 +5,8 @@ from .phone_dto import (
     PhoneSearchRequest,
     PhoneComparisonRequest,
     ChatRequest,
-    ChatResponse
+    ChatResponse,
+    ChatStreamEvent
 )
 
 __all__ = [
@@ -15,7 +16,8 @@ __all__ = [
     "PhoneSearchRequest",
     "PhoneComparisonRequest",
     "ChatRequest",
-    "ChatResponse"
+    "ChatResponse",
+    "ChatStreamEvent"
 ]
 
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 
 class CameraSpecs(BaseModel):
@@ -56,4 +56,10 @@ class ChatResponse(BaseModel):
     session_id: str
 
 
-
+class ChatStreamEvent(BaseModel):
+    type: Literal["token", "tool_start", "tool_end", "done", "error"]
+    content: Optional[str] = None
+    tool: Optional[str] = None
+    args: Optional[dict] = None
+    response: Optional[str] = None
+    session_id: Optional[str] = None
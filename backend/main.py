@@ -1,13 +1,25 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 from backend.config import settings
 from backend.api import router
+from backend.metrics import ServerTimingMiddleware
+from backend.services import warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.warmup_enabled:
+        warmup.start()
+    yield
+
 
 app = FastAPI(
     title="Mobile Shopping Agent API",
     description="AI-powered shopping assistant for mobile phones",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -18,6 +30,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.metrics_enabled and settings.metrics_timing_header:
+    app.add_middleware(ServerTimingMiddleware)
+
 app.include_router(router, prefix="/api")
 
 
@@ -0,0 +1,31 @@
+from .registry import Counter, Histogram, MetricsRegistry
+from .instruments import (
+    RequestMetrics,
+    current_request,
+    record_agent_turn,
+    record_llm_call,
+    record_stage,
+    record_tool_call,
+    registry,
+    set_outcome,
+    stage,
+    track_request
+)
+from .middleware import ServerTimingMiddleware
+
+__all__ = [
+    "Counter",
+    "Histogram",
+    "MetricsRegistry",
+    "RequestMetrics",
+    "ServerTimingMiddleware",
+    "current_request",
+    "record_agent_turn",
+    "record_llm_call",
+    "record_stage",
+    "record_tool_call",
+    "registry",
+    "set_outcome",
+    "stage",
+    "track_request"
+]
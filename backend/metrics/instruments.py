@@ -0,0 +1,168 @@
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+from backend.config import settings
+from backend.metrics.registry import MetricsRegistry
+
+registry = MetricsRegistry()
+
+CHAT_REQUESTS = registry.counter(
+    "shopping_chat_requests_total", "Chat requests by endpoint and outcome", ("endpoint", "outcome")
+)
+CHAT_REQUEST_SECONDS = registry.histogram(
+    "shopping_chat_request_seconds", "End-to-end chat request latency", ("endpoint", "outcome")
+)
+STAGE_SECONDS = registry.histogram(
+    "shopping_stage_seconds", "Time spent in each chat request stage", ("stage",)
+)
+LLM_CALLS = registry.counter("shopping_llm_calls_total", "Model calls made")
+LLM_TOKENS = registry.counter("shopping_llm_tokens_total", "Model tokens reported by the API", ("kind",))
+LLM_CALLS_PER_REQUEST = registry.histogram(
+    "shopping_llm_calls_per_request", "Model calls per chat request", buckets=(0, 1, 2, 3, 4, 5, 8)
+)
+LLM_TOKENS_PER_REQUEST = registry.histogram(
+    "shopping_llm_tokens_per_request", "Model tokens (input + output) per chat request",
+    buckets=(0, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+)
+TOOL_CALLS = registry.counter("shopping_tool_calls_total", "Tool calls by tool and source", ("tool", "source"))
+TOOL_SECONDS = registry.histogram("shopping_tool_seconds", "Tool execution time", ("tool",))
+AGENT_ITERATIONS = registry.histogram(
+    "shopping_agent_tool_iterations", "Tool-loop iterations per agent turn", buckets=(0, 1, 2, 3)
+)
+AGENT_ITERATION_CAP = registry.counter(
+    "shopping_agent_iteration_cap_total", "Agent turns that stopped at the tool-iteration cap"
+)
+
+
+@dataclass
+class RequestMetrics:
+    """Per-request totals, shared through a context variable."""
+    
+    outcome: str = "agent"
+    stages: Dict[str, float] = field(default_factory=dict)
+    llm_calls: int = 0
+    tokens: int = 0
+    
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items())
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+_NOOP = nullcontext()
+
+
+def current_request() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+def begin_request() -> RequestMetrics:
+    """Start per-request metrics for the current context (used by the timing middleware)."""
+    metrics = RequestMetrics()
+    _current.set(metrics)
+    return metrics
+
+
+class _Stage:
+    __slots__ = ("name", "started")
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        record_stage(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def stage(name: str):
+    """Time a block as a named stage; a shared no-op when metrics are disabled."""
+    if not settings.metrics_enabled:
+        return _NOOP
+    return _Stage(name)
+
+
+def record_stage(name: str, seconds: float):
+    if not settings.metrics_enabled:
+        return
+    STAGE_SECONDS.observe(seconds, name)
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.stages[name] = metrics.stages.get(name, 0.0) + seconds
+
+
+@contextmanager
+def track_request(endpoint: str) -> Iterator[Optional[RequestMetrics]]:
+    if not settings.metrics_enabled:
+        yield None
+        return
+    
+    metrics = _current.get()
+    token = None
+    if metrics is None:
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+    started = time.perf_counter()
+    try:
+        yield metrics
+    except BaseException:
+        if metrics.outcome == "agent":
+            metrics.outcome = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.stages["total"] = elapsed
+        CHAT_REQUESTS.inc(endpoint, metrics.outcome)
+        CHAT_REQUEST_SECONDS.observe(elapsed, endpoint, metrics.outcome)
+        LLM_CALLS_PER_REQUEST.observe(metrics.llm_calls)
+        LLM_TOKENS_PER_REQUEST.observe(metrics.tokens)
+        if token is not None:
+            try:
+                _current.reset(token)
+            except ValueError:
+                pass  # a stream finalized from another context
+
+
+def set_outcome(outcome: str):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.outcome = outcome
+
+
+def record_llm_call(response):
+    if not settings.metrics_enabled:
+        return
+    LLM_CALLS.inc()
+    usage = getattr(response, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    if input_tokens:
+        LLM_TOKENS.inc("input", amount=input_tokens)
+    if output_tokens:
+        LLM_TOKENS.inc("output", amount=output_tokens)
+    
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.llm_calls += 1
+        metrics.tokens += input_tokens + output_tokens
+
+
+def record_tool_call(tool: str, source: str, seconds: Optional[float] = None):
+    if not settings.metrics_enabled:
+        return
+    TOOL_CALLS.inc(tool, source)
+    if seconds is not None:
+        TOOL_SECONDS.observe(seconds, tool)
+        record_stage("tools", seconds)
+
+
+def record_agent_turn(iterations: int, capped: bool):
+    if not settings.metrics_enabled:
+        return
+    AGENT_ITERATIONS.observe(iterations)
+    if capped:
+        AGENT_ITERATION_CAP.inc()
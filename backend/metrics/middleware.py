@@ -0,0 +1,29 @@
+from backend.metrics.instruments import begin_request
+
+
+class ServerTimingMiddleware:
+    """Adds a ``Server-Timing`` header with the stages recorded for the request.
+    
+    Pure ASGI so it adds nothing but a dict lookup per message. Streaming
+    responses send headers before the agent runs, so for them the header
+    only covers the stages finished by then.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        metrics = begin_request()
+        
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and metrics.stages:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", metrics.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        await self.app(scope, receive, send_with_timing)
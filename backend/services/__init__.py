@@ -1,4 +1,25 @@
-from .chat_service import ChatService, chat_service
+import importlib
 from .safety_service import SafetyService, safety_service
+from .warmup import Warmup, warmup
 
-__all__ = ["ChatService", "chat_service", "SafetyService", "safety_service"]
+# The chat service and fast path import LangChain and the agent tools; they
+# load on first access so the API can serve the catalog before that
+_LAZY_MODULES = {
+    "ChatService": "chat_service",
+    "chat_service": "chat_service",
+    "FastPathRouter": "fast_path",
+    "fast_path_router": "fast_path",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY_MODULES[name]}", __name__)
+    value = getattr(module, name)
+    # Importing the submodule bound its module object to "chat_service"; rebind the instance
+    globals()[name] = value
+    return value
+
+
+__all__ = ["ChatService", "chat_service", "SafetyService", "safety_service", "FastPathRouter", "fast_path_router", "Warmup", "warmup"]
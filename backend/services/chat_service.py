@@ -1,35 +1,97 @@
+import asyncio
 import uuid
 import logging
-from typing import Dict
+from typing import AsyncIterator
 from fastapi import HTTPException
-from backend.agents import ShoppingAgentSession
+from backend.agents import LLMOverloadedError, ShoppingAgentSession, llm_limiter
+from backend.cache import (
+    answer_cache,
+    answer_flight,
+    data_version,
+    normalize_message,
+    tool_cache,
+    tool_flight
+)
+from backend.config import settings
+from backend.dao import phone_dao
+from backend.dto import ChatStreamEvent
+from backend.metrics import set_outcome, stage, track_request
+from backend.services.fast_path import fast_path_router
 from backend.services.safety_service import safety_service
+from backend.services.session_store import SessionStore, create_session_store
 
 logger = logging.getLogger(__name__)
 
 
 class ChatService:
-    def __init__(self):
-        self.sessions: Dict[str, ShoppingAgentSession] = {}
+    def __init__(self, session_store: SessionStore = None):
+        self.sessions: SessionStore = session_store or create_session_store()
     
     def get_or_create_session(self, session_id: str = None) -> tuple[str, ShoppingAgentSession]:
-        if session_id and session_id in self.sessions:
-            return session_id, self.sessions[session_id]
+        if session_id:
+            session = self.sessions.get(session_id)
+            if session is not None:
+                return session_id, session
         
         new_session_id = session_id or str(uuid.uuid4())
-        self.sessions[new_session_id] = ShoppingAgentSession()
-        return new_session_id, self.sessions[new_session_id]
+        session = ShoppingAgentSession()
+        self.sessions.put(new_session_id, session)
+        return new_session_id, session
+    
+    async def aget_or_create_session(self, session_id: str = None) -> tuple[str, ShoppingAgentSession]:
+        # Shared stores load and save off the event loop
+        if session_id:
+            session = await self.sessions.aget(session_id)
+            if session is not None:
+                return session_id, session
+        
+        new_session_id = session_id or str(uuid.uuid4())
+        session = ShoppingAgentSession()
+        await self.sessions.aput(new_session_id, session)
+        return new_session_id, session
     
     def chat(self, message: str, session_id: str = None) -> tuple[str, str]:
-        is_valid, error_msg = safety_service.validate_input(message)
+        return asyncio.run(self.achat(message, session_id))
+    
+    async def achat(self, message: str, session_id: str = None) -> tuple[str, str]:
+        with track_request("chat"):
+            return await self._achat(message, session_id)
+    
+    async def _achat(self, message: str, session_id: str = None) -> tuple[str, str]:
+        is_valid, error_msg = self._validate(message)
         if not is_valid:
             return error_msg, session_id or str(uuid.uuid4())
         
-        session_id, agent_session = self.get_or_create_session(session_id)
+        with stage("session"):
+            session_id, agent_session = await self.aget_or_create_session(session_id)
+        
+        routed = await self._route_fast_path(message, session_id, agent_session)
+        if routed is not None:
+            return routed, session_id
+        
+        first_turn = agent_session.is_new
+        cached = await self._cached_answer(message, session_id, agent_session) if first_turn else None
+        if cached is not None:
+            return cached, session_id
         
         try:
-            response = agent_session.chat(message)
+            if first_turn and settings.single_flight_enabled:
+                response = await self._shared_first_answer(message, agent_session)
+            else:
+                response = await agent_session.achat(message)
+            # Re-store so the history size and recency are accounted for
+            await self.sessions.aput(session_id, agent_session)
+            if first_turn:
+                self._remember_answer(message, response)
             return response, session_id
+        except LLMOverloadedError as e:
+            set_outcome("overloaded")
+            logger.warning(f"Chat request rejected: {e}")
+            raise HTTPException(
+                status_code=503,
+                detail="The assistant is busy right now. Please try again in a moment.",
+                headers={"Retry-After": str(max(1, round(e.retry_after)))}
+            )
         except Exception as e:
             logger.error(f"Error in chat service: {e}", exc_info=True)
             raise HTTPException(
@@ -37,9 +99,150 @@ class ChatService:
                 detail="Unable to process your request. Please try again later."
             )
     
+    async def astream(self, message: str, session_id: str = None) -> AsyncIterator[ChatStreamEvent]:
+        with track_request("stream"):
+            async for event in self._astream(message, session_id):
+                yield event
+    
+    async def _astream(self, message: str, session_id: str = None) -> AsyncIterator[ChatStreamEvent]:
+        is_valid, error_msg = self._validate(message)
+        if not is_valid:
+            yield ChatStreamEvent(type="done", response=error_msg, session_id=session_id or str(uuid.uuid4()))
+            return
+        
+        with stage("session"):
+            session_id, agent_session = await self.aget_or_create_session(session_id)
+        
+        routed = await self._route_fast_path(message, session_id, agent_session)
+        if routed is None and agent_session.is_new:
+            routed = await self._cached_answer(message, session_id, agent_session)
+            first_turn = True
+        else:
+            first_turn = False
+        if routed is not None:
+            yield ChatStreamEvent(type="done", response=routed, session_id=session_id)
+            return
+        
+        # Identical first questions already being answered are joined rather than re-run
+        shared = None
+        if first_turn and settings.single_flight_enabled:
+            shared, leader = answer_flight.acquire((normalize_message(message), data_version()))
+            if not leader:
+                async for event in self._join_answer(message, session_id, agent_session, shared):
+                    yield event
+                return
+        
+        try:
+            async for event in agent_session.astream(message):
+                yield ChatStreamEvent(session_id=session_id, **event)
+                if event["type"] == "done" and first_turn:
+                    self._remember_answer(message, event["response"])
+                    if shared is not None:
+                        shared.set_result(event["response"])
+            await self.sessions.aput(session_id, agent_session)
+        except Exception as e:
+            if shared is not None and not shared.done():
+                shared.set_exception(e)
+            # Headers are already sent, so errors are reported in-band
+            yield self._stream_error(e, session_id)
+        finally:
+            if shared is not None and not shared.done():
+                # Client went away before the answer was complete
+                shared.set_exception(RuntimeError("Shared answer was abandoned"))
+    
+    async def _shared_first_answer(self, message: str, agent_session: ShoppingAgentSession) -> str:
+        key = (normalize_message(message), data_version())
+        response = await answer_flight.share(key, lambda: agent_session.achat(message))
+        if agent_session.is_new:
+            # Joined another session's answer, so record the exchange here too
+            set_outcome("coalesced")
+            agent_session.add_exchange(message, response)
+        return response
+    
+    async def _join_answer(
+        self,
+        message: str,
+        session_id: str,
+        agent_session: ShoppingAgentSession,
+        shared: asyncio.Future
+    ) -> AsyncIterator[ChatStreamEvent]:
+        try:
+            response = await asyncio.shield(shared)
+        except Exception as e:
+            yield self._stream_error(e, session_id)
+            return
+        
+        set_outcome("coalesced")
+        agent_session.add_exchange(message, response)
+        await self.sessions.aput(session_id, agent_session)
+        yield ChatStreamEvent(type="done", response=response, session_id=session_id)
+    
+    def _validate(self, message: str) -> tuple[bool, str]:
+        with stage("safety"):
+            is_valid, error_msg = safety_service.validate_input(message)
+        if not is_valid:
+            set_outcome("rejected")
+        return is_valid, error_msg
+    
+    def _stream_error(self, error: Exception, session_id: str) -> ChatStreamEvent:
+        if isinstance(error, LLMOverloadedError):
+            set_outcome("overloaded")
+            logger.warning(f"Chat stream rejected: {error}")
+            content = "The assistant is busy right now. Please try again in a moment."
+        else:
+            set_outcome("error")
+            logger.error(f"Error in chat stream: {error}", exc_info=error)
+            content = "Unable to process your request. Please try again later."
+        return ChatStreamEvent(type="error", content=content, session_id=session_id)
+    
+    async def _route_fast_path(self, message: str, session_id: str, agent_session: ShoppingAgentSession):
+        if not settings.fast_path_enabled:
+            return None
+        
+        with stage("fast_path"):
+            result = fast_path_router.route(message, first_turn=agent_session.is_new)
+        if result is None:
+            return None
+        
+        set_outcome("fast_path")
+        agent_session.add_exchange(message, result.response)
+        await self.sessions.aput(session_id, agent_session)
+        return result.response
+    
+    async def _cached_answer(self, message: str, session_id: str, agent_session: ShoppingAgentSession):
+        if not settings.answer_cache_enabled:
+            return None
+        
+        with stage("answer_cache"):
+            cached = answer_cache.get(normalize_message(message), data_version())
+        if cached is None:
+            return None
+        
+        set_outcome("answer_cache")
+        agent_session.add_exchange(message, cached)
+        await self.sessions.aput(session_id, agent_session)
+        return cached
+    
+    def _remember_answer(self, message: str, response: str):
+        if settings.answer_cache_enabled and response:
+            answer_cache.set(normalize_message(message), response, data_version())
+    
     def clear_session(self, session_id: str):
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        self.sessions.delete(session_id)
+    
+    def session_stats(self) -> dict:
+        return self.sessions.stats()
+    
+    def runtime_stats(self) -> dict:
+        return {
+            "tool_cache": tool_cache.stats(),
+            "answer_cache": answer_cache.stats(),
+            "tool_flight": tool_flight.stats(),
+            "answer_flight": answer_flight.stats(),
+            "llm_limiter": llm_limiter.stats(),
+            "fast_path": fast_path_router.stats(),
+            "catalog": phone_dao.stats()
+        }
 
 
 chat_service = ChatService()
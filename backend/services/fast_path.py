@@ -0,0 +1,321 @@
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from backend.agents.tools import explain_technical_term
+from backend.dao import phone_dao, technical_terms_dao
+from backend.dto import PhoneDTO
+
+
+_AMOUNT = r"(?:₹|rs\.?|inr)?\s*(\d[\d,]*(?:\.\d+)?)\s*(k|thousand|lakhs?|l)?\b"
+_RANGE_PATTERNS = [
+    re.compile(rf"\bbetween\s+{_AMOUNT}\s+and\s+{_AMOUNT}"),
+    re.compile(rf"\bfrom\s+{_AMOUNT}\s+to\s+{_AMOUNT}"),
+    re.compile(rf"{_AMOUNT}\s*(?:-|to)\s*{_AMOUNT}"),
+]
+_MAX_PATTERN = re.compile(rf"\b(?:under|below|less\s+than|within|up\s*to|max(?:imum)?|not\s+more\s+than)\s+{_AMOUNT}")
+_MIN_PATTERN = re.compile(rf"\b(?:above|over|more\s+than|at\s+least|min(?:imum)?|starting\s+(?:at|from))\s+{_AMOUNT}")
+
+_BATTERY_PATTERN = re.compile(r"\b(\d{4,5})\s*mah(?:\s+battery)?\b")
+_CAMERA_PATTERN = re.compile(r"\b(\d{2,3})\s*mp(?:\s+(?:main\s+)?camera)?\b")
+_RAM_PATTERN = re.compile(r"\b(\d{1,2})\s*gb\s+(?:of\s+)?ram\b")
+
+_SORT_PATTERNS = [
+    (re.compile(r"\bbest\s+camera\b"), "camera"),
+    (re.compile(r"\bbest\s+battery(?:\s+life)?\b"), "battery"),
+    (re.compile(r"\bbest\s+performance\b"), "performance"),
+    (re.compile(r"\b(?:cheapest|most\s+affordable|lowest\s+price)\b"), "price"),
+    (re.compile(r"\b(?:value\s+for\s+money|best\s+value)\b"), "value"),
+    (re.compile(r"\b(?:all[\s-]?rounder|balanced)\b"), "balanced"),
+]
+
+_EXPLAIN_PATTERN = re.compile(
+    r"^(?:what\s+(?:is|are|does)|what's|whats|explain|define|meaning\s+of|tell\s+me\s+about)\s+"
+    r"(?:an?\s+|the\s+)?(?P<term>.+?)(?:\s+mean)?$"
+)
+_DIFFERENCE_PATTERN = re.compile(r"^(?:what\s+is\s+the\s+)?difference\s+between\s+(?P<first>.+?)\s+and\s+(?P<second>.+)$")
+
+_ANCHORS = {"phone", "phones", "mobile", "mobiles", "smartphone", "smartphones"}
+_FILLER = {
+    "show", "me", "list", "find", "suggest", "recommend", "some", "any", "a", "an", "the",
+    "with", "and", "having", "has", "have", "in", "for", "of", "good", "top", "please",
+    "i", "want", "need", "looking", "am", "budget", "price", "range", "rupees", "rs", "inr",
+    "what", "are", "is", "which", "can", "you", "get", "buy", "options", "android",
+    "support", "supports", "that", "my", "all",
+}
+
+
+@dataclass
+class ParsedQuery:
+    budget_min: Optional[int] = None
+    budget_max: Optional[int] = None
+    brand: Optional[str] = None
+    features: List[str] = field(default_factory=list)
+    min_camera_mp: Optional[int] = None
+    min_battery_mah: Optional[int] = None
+    min_ram_gb: Optional[int] = None
+    sort_by: str = "price"
+    leftover: List[str] = field(default_factory=list)
+    has_anchor: bool = False
+    
+    @property
+    def has_constraints(self) -> bool:
+        return any([
+            self.budget_min, self.budget_max, self.brand, self.features,
+            self.min_camera_mp, self.min_battery_mah, self.min_ram_gb
+        ])
+
+
+@dataclass
+class FastPathResult:
+    kind: str
+    response: str
+    phones: List[PhoneDTO] = field(default_factory=list)
+
+
+def _parse_amount(number: str, unit: Optional[str]) -> int:
+    value = float(number.replace(",", ""))
+    if unit in ("k", "thousand"):
+        value *= 1000
+    elif unit in ("lakh", "lakhs", "l"):
+        value *= 100000
+    return int(value)
+
+
+def _normalize(message: str) -> str:
+    text = message.lower().strip()
+    text = re.sub(r"[?!.]+$", "", text)
+    return re.sub(r"\s+", " ", text)
+
+
+class FastPathRouter:
+    """Answers plain catalog lookups and term explanations without the LLM.
+    
+    A message is only handled when every word is accounted for by a
+    recognized constraint or filler word; anything else (comparisons,
+    "for gaming", ...) falls through to the agent. Catalog searches are
+    only answered on a session's first turn, since a later "phones under
+    20k" usually narrows what was asked before; term explanations stand on
+    their own and are answered on any turn.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vocabulary_catalog = None
+        self._brands: Dict[str, str] = {}
+        self._feature_patterns: List[Tuple[re.Pattern, str]] = []
+        self.counters: Dict[str, int] = {"total": 0, "search": 0, "explain": 0, "fallback": 0}
+    
+    def route(self, message: str, first_turn: bool = True) -> Optional[FastPathResult]:
+        text = _normalize(message)
+        result = self._route_explain(text)
+        if result is None and first_turn:
+            result = self._route_search(text)
+        
+        with self._lock:
+            self.counters["total"] += 1
+            self.counters[result.kind if result else "fallback"] += 1
+        return result
+    
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats: Dict[str, float] = dict(self.counters)
+        handled = stats["search"] + stats["explain"]
+        stats["hit_rate"] = handled / stats["total"] if stats["total"] else 0.0
+        return stats
+    
+    def parse(self, text: str) -> ParsedQuery:
+        self._refresh_vocabulary()
+        parsed = ParsedQuery()
+        remaining = text
+        
+        def consume(match: re.Match) -> str:
+            nonlocal remaining
+            remaining = remaining[:match.start()] + " " * (match.end() - match.start()) + remaining[match.end():]
+            return match.group(0)
+        
+        for pattern in _RANGE_PATTERNS:
+            match = pattern.search(remaining)
+            if match:
+                low = _parse_amount(match.group(1), match.group(2))
+                high = _parse_amount(match.group(3), match.group(4))
+                parsed.budget_min, parsed.budget_max = min(low, high), max(low, high)
+                consume(match)
+                break
+        
+        match = _MAX_PATTERN.search(remaining)
+        if match and parsed.budget_max is None:
+            parsed.budget_max = _parse_amount(match.group(1), match.group(2))
+            consume(match)
+        match = _MIN_PATTERN.search(remaining)
+        if match and parsed.budget_min is None:
+            parsed.budget_min = _parse_amount(match.group(1), match.group(2))
+            consume(match)
+        
+        for pattern, attr in (
+            (_BATTERY_PATTERN, "min_battery_mah"),
+            (_CAMERA_PATTERN, "min_camera_mp"),
+            (_RAM_PATTERN, "min_ram_gb"),
+        ):
+            match = pattern.search(remaining)
+            if match:
+                setattr(parsed, attr, int(match.group(1)))
+                consume(match)
+        
+        for pattern, sort_by in _SORT_PATTERNS:
+            match = pattern.search(remaining)
+            if match:
+                parsed.sort_by = sort_by
+                consume(match)
+                break
+        
+        for pattern, feature in self._feature_patterns:
+            match = pattern.search(remaining)
+            if match:
+                parsed.features.append(feature)
+                consume(match)
+        
+        for word in re.findall(r"[a-z0-9₹+]+", remaining):
+            if word in self._brands and parsed.brand is None:
+                parsed.brand = self._brands[word]
+                parsed.has_anchor = True
+            elif word in _ANCHORS:
+                parsed.has_anchor = True
+            elif word not in _FILLER:
+                parsed.leftover.append(word)
+        
+        return parsed
+    
+    def _refresh_vocabulary(self):
+        catalog = phone_dao.get_all()
+        if self._vocabulary_catalog is catalog:
+            return
+        
+        with self._lock:
+            brands = {phone.brand.lower(): phone.brand for phone in catalog}
+            camera_features = {cf.lower() for phone in catalog for cf in phone.specs.camera.features}
+            # Features that are also camera features ("OIS") are matched inconsistently
+            # by search_phones, so leave those to the agent
+            features = {f.lower(): f for phone in catalog for f in phone.features if f.lower() not in camera_features}
+            self._brands = brands
+            self._feature_patterns = [
+                (re.compile(rf"(?<![a-z0-9]){re.escape(lower)}(?![a-z0-9])"), feature)
+                for lower, feature in sorted(features.items(), key=lambda item: -len(item[0]))
+            ]
+            self._vocabulary_catalog = catalog
+    
+    def _route_explain(self, text: str) -> Optional[FastPathResult]:
+        term = None
+        match = _DIFFERENCE_PATTERN.match(text)
+        if match:
+            term = f"{match.group('first')} vs {match.group('second')}"
+        else:
+            match = _EXPLAIN_PATTERN.match(text)
+            if match:
+                term = match.group("term")
+            elif " vs " in text or " versus " in text:
+                term = text
+        
+        if not term:
+            return None
+        
+        separator = " versus " if " versus " in term else " vs "
+        parts = [part.strip() for part in term.split(separator)] if separator in term else [term]
+        if len(parts) > 2 or not all(technical_terms_dao.get(part) for part in parts):
+            return None
+        
+        response = explain_technical_term.invoke({"term": " vs ".join(parts)})
+        return FastPathResult(kind="explain", response=response)
+    
+    def _route_search(self, text: str) -> Optional[FastPathResult]:
+        parsed = self.parse(text)
+        if parsed.leftover or not parsed.has_anchor or not parsed.has_constraints:
+            return None
+        # Small numbers are more likely model numbers or specs than prices
+        if any(budget is not None and budget < 1000 for budget in (parsed.budget_min, parsed.budget_max)):
+            return None
+        
+        # search() treats features as any-of; a message listing several means all of them
+        results = phone_dao.search(
+            budget_min=parsed.budget_min,
+            budget_max=parsed.budget_max,
+            brand=parsed.brand,
+            features=parsed.features[:1] or None,
+            min_camera_mp=parsed.min_camera_mp,
+            min_battery_mah=parsed.min_battery_mah,
+            min_ram_gb=parsed.min_ram_gb,
+            sort_by=parsed.sort_by
+        )
+        if len(parsed.features) > 1:
+            wanted = {f.lower() for f in parsed.features}
+            results = [p for p in results if wanted <= {f.lower() for f in p.features}]
+        total = len(results)
+        results = results[:5]
+        
+        return FastPathResult(kind="search", response=self._render_search(parsed, results, total), phones=results)
+    
+    @staticmethod
+    def _describe(parsed: ParsedQuery) -> str:
+        parts = []
+        if parsed.brand:
+            parts.append(parsed.brand)
+        parts.append("phones")
+        if parsed.budget_min and parsed.budget_max:
+            parts.append(f"between ₹{parsed.budget_min:,} and ₹{parsed.budget_max:,}")
+        elif parsed.budget_max:
+            parts.append(f"under ₹{parsed.budget_max:,}")
+        elif parsed.budget_min:
+            parts.append(f"above ₹{parsed.budget_min:,}")
+        
+        specs = list(parsed.features)
+        if parsed.min_camera_mp:
+            specs.append(f"{parsed.min_camera_mp}MP+ camera")
+        if parsed.min_battery_mah:
+            specs.append(f"{parsed.min_battery_mah}mAh+ battery")
+        if parsed.min_ram_gb:
+            specs.append(f"{parsed.min_ram_gb}GB+ RAM")
+        if specs:
+            parts.append("with " + ", ".join(specs))
+        return " ".join(parts)
+    
+    @classmethod
+    def _render_search(cls, parsed: ParsedQuery, phones: List[PhoneDTO], total: int) -> str:
+        description = cls._describe(parsed)
+        if not phones:
+            return (
+                f"I couldn't find any {description} in our catalog. "
+                "Try widening the budget or dropping a requirement, and I'll search again."
+            )
+        
+        ordering = {
+            "camera": "sorted by main camera",
+            "battery": "sorted by battery capacity",
+            "performance": "sorted by RAM",
+            "price": "sorted by price",
+            "value": "ranked by value for money",
+            "balanced": "ranked by overall camera, battery, performance and display",
+        }[parsed.sort_by]
+        matches = "1 match" if total == 1 else f"{total} matches"
+        shown = f". Here are the top {len(phones)}:" if total > len(phones) else ":"
+        lines = [f"Found {matches} for {description}, {ordering}{shown}", ""]
+        for position, phone in enumerate(phones, start=1):
+            specs = phone.specs
+            name = phone.model if phone.model.lower().startswith(phone.brand.lower()) else f"{phone.brand} {phone.model}"
+            lines.append(f"{position}. **{name}** - ₹{phone.price:,}")
+            lines.append(
+                f"   {specs.display_inches}\" {specs.refresh_rate_hz}Hz display, {specs.camera.main_mp}MP main camera, "
+                f"{specs.battery_mah}mAh battery ({specs.fast_charging_w}W), {specs.processor}, "
+                f"{specs.ram_gb}GB RAM / {specs.storage_gb}GB"
+            )
+            if phone.features:
+                lines.append(f"   Features: {', '.join(phone.features)}")
+            if phone.pros:
+                lines.append(f"   Pros: {', '.join(phone.pros)}")
+            if phone.cons:
+                lines.append(f"   Cons: {', '.join(phone.cons)}")
+        lines.append("")
+        lines.append("Want me to compare any of these or explain a spec?")
+        return "\n".join(lines)
+
+
+fast_path_router = FastPathRouter()
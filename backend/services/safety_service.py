@@ -1,9 +1,20 @@
 import re
-from typing import Tuple
+from typing import Pattern, Sequence, Tuple
+
+
+def _compile_any(patterns: Sequence[str]) -> Pattern:
+    # One alternation, one scan: it matches wherever any single pattern would.
+    # Non-capturing groups keep the engine's fast path (named groups cost ~8x).
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+def _compile_keywords(keywords: Sequence[str]) -> Pattern:
+    # Plain substring matches, as with `keyword in text`
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
 
 
 class SafetyService:
-    
+
     ADVERSARIAL_PATTERNS = [
         r"ignore\s+(previous|above|all|your)\s+(instructions?|rules?|prompts?)",
         r"reveal\s+(your\s+)?(system\s+)?(prompt|instructions?|rules?)",
@@ -35,52 +46,58 @@ class SafetyService:
         r"trash\s+(apple|samsung|xiaomi|oneplus|google|nothing|brand\s+[a-z]+)",
     ]
     
+    # Every toxic pattern needs one of these words, so a plain keyword scan
+    # rules most messages out before the full patterns run
+    TOXIC_TRIGGERS = ["trash", "garbage", "shit", "crap", "suck", "hate", "worst", "terrible", "awful"]
+    
     OFF_TOPIC_KEYWORDS = [
         "weather", "news", "politics", "recipe", "cooking", "movie", "song",
         "game", "sport", "football", "cricket", "stock", "investment",
         "health", "medical", "doctor", "medicine", "disease"
     ]
     
+    PHONE_KEYWORDS = ["phone", "mobile", "smartphone", "camera", "battery", "processor", "ram", "display"]
+    
+    ADVERSARIAL_MESSAGE = "I'm here to help you find the perfect mobile phone. I can't assist with that request."
+    TOXIC_MESSAGE = "I maintain a neutral and factual approach. I can provide objective comparisons if you'd like."
+    OFF_TOPIC_MESSAGE = "I specialize in helping with mobile phone shopping. How can I assist you in finding the right phone?"
+    
+    _ADVERSARIAL_RE = _compile_any(ADVERSARIAL_PATTERNS)
+    _TOXIC_RE = _compile_any(TOXIC_PATTERNS)
+    _TOXIC_TRIGGER_RE = _compile_keywords(TOXIC_TRIGGERS)
+    _PHONE_RE = _compile_keywords(PHONE_KEYWORDS)
+    _OFF_TOPIC_RE = _compile_keywords(OFF_TOPIC_KEYWORDS)
+    
     @staticmethod
     def is_adversarial(message: str) -> Tuple[bool, str]:
-        message_lower = message.lower()
-        
-        for pattern in SafetyService.ADVERSARIAL_PATTERNS:
-            if re.search(pattern, message_lower):
-                return True, "I'm here to help you find the perfect mobile phone. I can't assist with that request."
-        
+        if SafetyService._ADVERSARIAL_RE.search(message.lower()):
+            return True, SafetyService.ADVERSARIAL_MESSAGE
         return False, ""
     
     @staticmethod
     def is_toxic(message: str) -> Tuple[bool, str]:
-        message_lower = message.lower()
-        
-        for pattern in SafetyService.TOXIC_PATTERNS:
-            if re.search(pattern, message_lower):
-                return True, "I maintain a neutral and factual approach. I can provide objective comparisons if you'd like."
-        
+        if SafetyService._toxic(message.lower()):
+            return True, SafetyService.TOXIC_MESSAGE
         return False, ""
     
     @staticmethod
     def is_off_topic(message: str) -> Tuple[bool, str]:
-        message_lower = message.lower()
-        
-        if len(message_lower.split()) < 3:
-            return False, ""
-        
-        phone_keywords = ["phone", "mobile", "smartphone", "camera", "battery", "processor", "ram", "display"]
-        has_phone_context = any(keyword in message_lower for keyword in phone_keywords)
-        
-        if has_phone_context:
-            return False, ""
-        
-        off_topic_count = sum(1 for keyword in SafetyService.OFF_TOPIC_KEYWORDS if keyword in message_lower)
-        
-        if off_topic_count >= 1:
-            return True, "I specialize in helping with mobile phone shopping. How can I assist you in finding the right phone?"
-        
+        if SafetyService._off_topic(message.lower()):
+            return True, SafetyService.OFF_TOPIC_MESSAGE
         return False, ""
     
+    @staticmethod
+    def _toxic(message_lower: str) -> bool:
+        return bool(SafetyService._TOXIC_TRIGGER_RE.search(message_lower) and SafetyService._TOXIC_RE.search(message_lower))
+    
+    @staticmethod
+    def _off_topic(message_lower: str) -> bool:
+        if len(message_lower.split()) < 3:
+            return False
+        if SafetyService._PHONE_RE.search(message_lower):
+            return False
+        return SafetyService._OFF_TOPIC_RE.search(message_lower) is not None
+    
     @staticmethod
     def validate_input(message: str) -> Tuple[bool, str]:
         if not message or len(message.strip()) == 0:
@@ -89,17 +106,17 @@ class SafetyService:
         if len(message) > 500:
             return False, "Message too long. Please keep it under 500 characters."
         
-        is_adv, adv_msg = SafetyService.is_adversarial(message)
-        if is_adv:
-            return False, adv_msg
+        # Lower-case once and run each category's combined pattern
+        message_lower = message.lower()
+        
+        if SafetyService._ADVERSARIAL_RE.search(message_lower):
+            return False, SafetyService.ADVERSARIAL_MESSAGE
         
-        is_tox, tox_msg = SafetyService.is_toxic(message)
-        if is_tox:
-            return False, tox_msg
+        if SafetyService._toxic(message_lower):
+            return False, SafetyService.TOXIC_MESSAGE
         
-        is_off, off_msg = SafetyService.is_off_topic(message)
-        if is_off:
-            return False, off_msg
+        if SafetyService._off_topic(message_lower):
+            return False, SafetyService.OFF_TOPIC_MESSAGE
         
         return True, ""
 
@@ -0,0 +1,548 @@
+import asyncio
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from backend.agents import ShoppingAgentSession
+from backend.agents.memory import decode_message, encode_message
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore(ABC):
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[ShoppingAgentSession]:
+        ...
+    
+    @abstractmethod
+    def put(self, session_id: str, session: ShoppingAgentSession):
+        ...
+    
+    @abstractmethod
+    def delete(self, session_id: str):
+        ...
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+    
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+    
+    # Async callers use these; stores that do I/O keep it off the event loop
+    async def aget(self, session_id: str) -> Optional[ShoppingAgentSession]:
+        return self.get(session_id)
+    
+    async def aput(self, session_id: str, session: ShoppingAgentSession):
+        self.put(session_id, session)
+    
+    def stats(self) -> Dict[str, int]:
+        return {"sessions": len(self)}
+
+
+@dataclass
+class _Entry:
+    session: ShoppingAgentSession
+    last_access: float
+    size: int
+
+
+class InMemorySessionStore(SessionStore):
+    """LRU session store with idle TTL, a session count cap and a total history byte cap."""
+    
+    def __init__(
+        self,
+        max_sessions: int = 10000,
+        ttl_seconds: float = 3600,
+        max_history_bytes: int = 256 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_history_bytes = max_history_bytes
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.evicted_expired = 0
+        self.evicted_lru = 0
+        self.evicted_memory = 0
+    
+    def get(self, session_id: str) -> Optional[ShoppingAgentSession]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            
+            now = self._clock()
+            if self._is_expired(entry, now):
+                self._remove(session_id)
+                self.evicted_expired += 1
+                return None
+            
+            entry.last_access = now
+            self._entries.move_to_end(session_id)
+            return entry.session
+    
+    def put(self, session_id: str, session: ShoppingAgentSession):
+        size = session.history_bytes()
+        with self._lock:
+            now = self._clock()
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                self._total_bytes -= entry.size
+                entry.session = session
+                entry.size = size
+                entry.last_access = now
+                self._entries.move_to_end(session_id)
+            else:
+                self._entries[session_id] = _Entry(session, now, size)
+            self._total_bytes += size
+            
+            self._evict(now, keep=session_id)
+    
+    def delete(self, session_id: str):
+        with self._lock:
+            if session_id in self._entries:
+                self._remove(session_id)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sessions": len(self._entries),
+            "history_bytes": self._total_bytes,
+            "evicted_expired": self.evicted_expired,
+            "evicted_lru": self.evicted_lru,
+            "evicted_memory": self.evicted_memory,
+        }
+    
+    def _is_expired(self, entry: _Entry, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - entry.last_access > self.ttl_seconds
+    
+    def _remove(self, session_id: str):
+        entry = self._entries.pop(session_id)
+        self._total_bytes -= entry.size
+    
+    def _evict(self, now: float, keep: str):
+        # Entries are ordered by last access, so expired ones sit at the front
+        while self._entries:
+            oldest_id, oldest = next(iter(self._entries.items()))
+            if oldest_id == keep or not self._is_expired(oldest, now):
+                break
+            self._remove(oldest_id)
+            self.evicted_expired += 1
+        
+        while len(self._entries) > self.max_sessions:
+            oldest_id = next(iter(self._entries))
+            if oldest_id == keep:
+                break
+            self._remove(oldest_id)
+            self.evicted_lru += 1
+        
+        while self._total_bytes > self.max_history_bytes and len(self._entries) > 1:
+            oldest_id = next(iter(self._entries))
+            if oldest_id == keep:
+                break
+            self._remove(oldest_id)
+            self.evicted_memory += 1
+
+
+def encode_session(state: dict) -> bytes:
+    return zlib.compress(json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def decode_session(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob))
+
+
+# A stored session: (encoded state, version)
+Record = Tuple[bytes, int]
+
+
+@dataclass
+class _Write:
+    """A session's latest state plus the messages added since ``base_version``.
+    
+    If the stored copy has moved past ``base_version`` (another worker or
+    request saved it meanwhile), the new messages are replayed onto that
+    copy instead of overwriting it.
+    """
+    state: dict
+    base_version: int
+    version: int
+    new_messages: List[list] = field(default_factory=list)
+    
+    def resolve(self, current: Optional[Record]) -> Record:
+        current_version = current[1] if current else 0
+        if current_version == self.base_version:
+            return encode_session(self.state), self.version
+        
+        merged = ShoppingAgentSession.from_state(decode_session(current[0])) if current else ShoppingAgentSession()
+        merged.append_messages([decode_message(data) for data in self.new_messages])
+        return encode_session(merged.to_state()), max(current_version, self.version) + 1
+
+
+class SessionBackend(ABC):
+    """Storage shared by every worker; ``commit`` resolves each write against the stored record atomically."""
+    
+    @abstractmethod
+    def load(self, session_id: str, max_age: float) -> Optional[Record]:
+        ...
+    
+    @abstractmethod
+    def commit(self, writes: Dict[str, _Write]) -> int:
+        """Store every write in one batch; returns how many had to be merged."""
+    
+    @abstractmethod
+    def delete(self, session_id: str):
+        ...
+    
+    @abstractmethod
+    def count(self, max_age: float) -> int:
+        ...
+    
+    def purge(self, max_age: float):
+        pass
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """Sessions in one SQLite file; safe for several worker processes on the same host.
+    
+    Reads and writes use separate connections. In WAL mode a read never
+    waits for a write transaction, so loads are not held up by a flush.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id TEXT PRIMARY KEY, version INTEGER NOT NULL, data BLOB NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)")
+        self._read_conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._read_lock = threading.Lock()
+    
+    def load(self, session_id: str, max_age: float) -> Optional[Record]:
+        with self._read_lock:
+            row = self._read_conn.execute(
+                "SELECT data, version FROM sessions WHERE id = ? AND updated_at >= ?",
+                (session_id, _cutoff(max_age))
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+    
+    def commit(self, writes: Dict[str, _Write]) -> int:
+        merged = 0
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so read-check-write is atomic across processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for session_id, write in writes.items():
+                    row = self._conn.execute("SELECT data, version FROM sessions WHERE id = ?", (session_id,)).fetchone()
+                    data, version = write.resolve((row[0], row[1]) if row else None)
+                    merged += version != write.version
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO sessions (id, version, data, updated_at) VALUES (?, ?, ?, ?)",
+                        (session_id, version, data, now)
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return merged
+    
+    def delete(self, session_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+    
+    def count(self, max_age: float) -> int:
+        with self._read_lock:
+            return self._read_conn.execute("SELECT COUNT(*) FROM sessions WHERE updated_at >= ?", (_cutoff(max_age),)).fetchone()[0]
+    
+    def purge(self, max_age: float):
+        if max_age > 0:
+            with self._lock:
+                self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (_cutoff(max_age),))
+
+
+class RedisSessionBackend(SessionBackend):
+    """Sessions as Redis hashes with key expiry; needs the optional ``redis`` package.
+    
+    A sorted set of session ids scored by last save backs ``count`` and
+    ``purge``, so neither scans the keyspace.
+    """
+    
+    def __init__(self, url: str, prefix: str = "shopping:session:"):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("SESSION_STORE_BACKEND=redis needs the redis package (pip install redis)")
+        self._redis = redis
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.index_key = f"{prefix}index"
+        self.ttl_seconds = 0
+    
+    def load(self, session_id: str, max_age: float) -> Optional[Record]:
+        data, version, updated_at = self._client.hmget(self.prefix + session_id, "data", "version", "updated_at")
+        if data is None or (updated_at is not None and float(updated_at) < _cutoff(max_age)):
+            return None
+        return data, int(version)
+    
+    def commit(self, writes: Dict[str, _Write]) -> int:
+        merged = 0
+        for session_id, write in writes.items():
+            key = self.prefix + session_id
+            with self._client.pipeline() as pipe:
+                while True:
+                    try:
+                        # WATCH makes EXEC fail if another worker saved the session in between
+                        pipe.watch(key)
+                        data, version = pipe.hmget(key, "data", "version")
+                        data, version = write.resolve((data, int(version)) if data is not None else None)
+                        pipe.multi()
+                        now = time.time()
+                        pipe.hset(key, mapping={"data": data, "version": version, "updated_at": now})
+                        pipe.zadd(self.index_key, {session_id: now})
+                        if self.ttl_seconds > 0:
+                            pipe.expire(key, int(self.ttl_seconds))
+                        pipe.execute()
+                        break
+                    except self._redis.WatchError:
+                        continue
+            merged += version != write.version
+        return merged
+    
+    def delete(self, session_id: str):
+        with self._client.pipeline() as pipe:
+            pipe.delete(self.prefix + session_id)
+            pipe.zrem(self.index_key, session_id)
+            pipe.execute()
+    
+    def count(self, max_age: float) -> int:
+        return self._client.zcount(self.index_key, _cutoff(max_age), "+inf")
+    
+    def purge(self, max_age: float):
+        # The hashes expire on their own; this drops their index entries
+        if max_age > 0:
+            self._client.zremrangebyscore(self.index_key, "-inf", f"({_cutoff(max_age)}")
+
+
+def _cutoff(max_age: float) -> float:
+    return time.time() - max_age if max_age > 0 else 0.0
+
+
+class SharedSessionStore(SessionStore):
+    """Sessions kept in a backend shared by all workers, so any worker can continue any conversation.
+    
+    Sessions are stored as compressed compact JSON. Saves are buffered and
+    written in batches every ``flush_interval`` seconds (0 writes through);
+    reads in this process see buffered saves immediately. Concurrent turns on
+    one session are reconciled optimistically: each save carries the version
+    it started from, and a save that lost the race has its new messages
+    replayed onto the winner's copy rather than overwriting it.
+    """
+    
+    def __init__(
+        self,
+        backend: SessionBackend,
+        ttl_seconds: float = 3600,
+        flush_interval: float = 0.05,
+        max_batch: int = 100
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: Dict[str, _Write] = {}
+        self._flushing: Dict[str, _Write] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._last_purge = time.monotonic()
+        self.flushes = 0
+        self.writes = 0
+        self.merges = 0
+        self.flush_errors = 0
+        if flush_interval > 0:
+            threading.Thread(target=self._flush_loop, name="session-writer", daemon=True).start()
+            atexit.register(self.close)
+    
+    def get(self, session_id: str) -> Optional[ShoppingAgentSession]:
+        session = self._buffered(session_id)
+        if session is not None:
+            return session
+        return self._decode(self.backend.load(session_id, self.ttl_seconds))
+    
+    async def aget(self, session_id: str) -> Optional[ShoppingAgentSession]:
+        session = self._buffered(session_id)
+        if session is not None:
+            return session
+        record = await asyncio.to_thread(self.backend.load, session_id, self.ttl_seconds)
+        return self._decode(record)
+    
+    def _buffered(self, session_id: str) -> Optional[ShoppingAgentSession]:
+        with self._lock:
+            buffered = self._pending.get(session_id) or self._flushing.get(session_id)
+        if buffered is None:
+            return None
+        return ShoppingAgentSession.from_state(buffered.state, buffered.version)
+    
+    def _decode(self, record: Optional[Record]) -> Optional[ShoppingAgentSession]:
+        if record is None:
+            return None
+        data, version = record
+        return ShoppingAgentSession.from_state(decode_session(data), version)
+    
+    def put(self, session_id: str, session: ShoppingAgentSession):
+        if self._buffer(session_id, session):
+            self.flush()
+    
+    async def aput(self, session_id: str, session: ShoppingAgentSession):
+        if self._buffer(session_id, session):
+            await asyncio.to_thread(self.flush)
+    
+    def _buffer(self, session_id: str, session: ShoppingAgentSession) -> bool:
+        """Queue the save; True if the caller should flush now (write-through)."""
+        new_messages = [encode_message(message) for message in session.unsynced_messages()]
+        with self._lock:
+            pending = self._pending.get(session_id)
+            known = pending or self._flushing.get(session_id)
+            if known is None or session.store_version == known.version:
+                state = session.to_state()
+            else:
+                # Another request saved this session after ours loaded it
+                merged = ShoppingAgentSession.from_state(known.state)
+                merged.append_messages([decode_message(data) for data in new_messages])
+                state = merged.to_state()
+                self.merges += 1
+            
+            version = (known.version if known else session.store_version) + 1
+            if pending is not None:
+                pending.state = state
+                pending.version = version
+                pending.new_messages.extend(new_messages)
+            else:
+                base = known.version if known else session.store_version
+                self._pending[session_id] = _Write(state, base, version, new_messages)
+            session.mark_synced(version)
+            batch_full = len(self._pending) >= self.max_batch
+        
+        if self.flush_interval <= 0:
+            return True
+        if batch_full:
+            self._wake.set()
+        return False
+    
+    def delete(self, session_id: str):
+        # Wait out a flush in progress, or its commit would bring the session back
+        with self._flush_lock:
+            with self._lock:
+                self._pending.pop(session_id, None)
+            self.backend.delete(session_id)
+    
+    def __len__(self) -> int:
+        return self.backend.count(self.ttl_seconds)
+    
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id in self._pending or session_id in self._flushing:
+                return True
+        return self.backend.load(session_id, self.ttl_seconds) is not None
+    
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._flushing, self._pending = self._pending, {}
+            try:
+                self.merges += self.backend.commit(self._flushing)
+                self.writes += len(self._flushing)
+                self.flushes += 1
+            except Exception as e:
+                self.flush_errors += 1
+                logger.error(f"Session flush failed, will retry: {e}", exc_info=True)
+                with self._lock:
+                    # Newer saves of the same session already include these messages
+                    for session_id, write in self._flushing.items():
+                        newer = self._pending.get(session_id)
+                        if newer is None:
+                            self._pending[session_id] = write
+                        else:
+                            newer.base_version = write.base_version
+                            newer.new_messages[:0] = write.new_messages
+            finally:
+                with self._lock:
+                    self._flushing = {}
+    
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            if time.monotonic() - self._last_purge > 60:
+                self._last_purge = time.monotonic()
+                try:
+                    self.backend.purge(self.ttl_seconds)
+                except Exception as e:
+                    logger.warning(f"Session purge failed: {e}")
+    
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self.flush()
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "sessions": len(self),
+            "pending_writes": pending,
+            "writes": self.writes,
+            "flushes": self.flushes,
+            "merges": self.merges,
+            "flush_errors": self.flush_errors,
+        }
+
+
+def create_session_store() -> SessionStore:
+    if settings.session_store_backend == "memory":
+        return InMemorySessionStore(
+            max_sessions=settings.session_max_count,
+            ttl_seconds=settings.session_ttl_seconds,
+            max_history_bytes=settings.session_max_history_bytes
+        )
+    if settings.session_store_backend == "sqlite":
+        backend = SQLiteSessionBackend(settings.session_sqlite_path)
+    elif settings.session_store_backend == "redis":
+        backend = RedisSessionBackend(settings.session_redis_url)
+        backend.ttl_seconds = settings.session_ttl_seconds
+    else:
+        raise ValueError(f"Unknown session store backend: {settings.session_store_backend}")
+    return SharedSessionStore(
+        backend,
+        ttl_seconds=settings.session_ttl_seconds,
+        flush_interval=settings.session_write_behind_ms / 1000,
+        max_batch=settings.session_write_batch_size
+    )
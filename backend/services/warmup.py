@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+def _build_catalog_indexes():
+    from backend.dao import phone_dao
+    phone_dao.snapshot.similar
+
+
+def _render_phone_list():
+    from backend.api.phone_responses import phone_responses
+    from backend.dao import phone_dao
+    phone_responses.list_phones(phone_dao.snapshot)
+
+
+def _import_chat_service():
+    from backend import services
+    services.chat_service
+
+
+def _prepare_llm():
+    # The SDK import and tool schema conversion take over a second; keep them off the loop
+    from backend.agents.shopping_agent import prepare_llm
+    prepare_llm()
+
+
+def _create_llm_clients():
+    # Clients are per event loop, so this step runs on the server's loop;
+    # after _prepare_llm it is only the client constructors
+    from backend.agents import get_shared_llm
+    get_shared_llm()
+
+
+# (name, step, runs in a worker thread)
+STEPS: List[Tuple[str, Callable[[], Any], bool]] = [
+    ("catalog_indexes", _build_catalog_indexes, True),
+    ("phone_list", _render_phone_list, True),
+    ("chat_service", _import_chat_service, True),
+    ("llm_sdk", _prepare_llm, True),
+    ("llm_clients", _create_llm_clients, False),
+]
+
+
+class Warmup:
+    """Opt-in background warm-up of what the first requests would otherwise pay for.
+    
+    Builds the lazy catalog indexes, pre-renders ``/api/phones``, imports the
+    chat stack (LangChain, the Gemini SDK, agent tools) and creates the LLM
+    clients. ``/api/ready`` answers 503 until it has finished.
+    """
+    
+    def __init__(self):
+        self.state = "off"
+        self.timings_ms: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self._task = None
+    
+    @property
+    def ready(self) -> bool:
+        return self.state in ("off", "done")
+    
+    def start(self):
+        self.state = "running"
+        # Keep a reference so the task is not garbage collected mid-run
+        self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
+    
+    async def run(self):
+        self.state = "running"
+        started = time.perf_counter()
+        for name, step, in_thread in STEPS:
+            step_started = time.perf_counter()
+            try:
+                if in_thread:
+                    await run_in_threadpool(step)
+                else:
+                    step()
+            except Exception as e:
+                self.state = "failed"
+                self.error = f"{name}: {e}"
+                logger.error(f"Warm-up step {name} failed: {e}", exc_info=True)
+                return
+            self.timings_ms[name] = round((time.perf_counter() - step_started) * 1000, 1)
+        self.state = "done"
+        logger.info(f"Warm-up finished in {(time.perf_counter() - started) * 1000:.0f} ms: {self.timings_ms}")
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "timings_ms": dict(self.timings_ms), "error": self.error}
+
+
+warmup = Warmup()
@@ -0,0 +1,68 @@
+"""Saved benchmark baselines, so regressions show up as a diff against the last run.
+
+Results are flat {metric: value} dicts. Metrics ending in ``rps`` are better
+when higher; everything else (latencies, bytes) is better when lower.
+"""
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_THRESHOLD = 0.25
+
+
+def baseline_path(name: str) -> Path:
+    return BASELINE_DIR / f"{name}.json"
+
+
+def save_baseline(name: str, results: Dict[str, float], config: Optional[dict] = None) -> Path:
+    BASELINE_DIR.mkdir(exist_ok=True)
+    path = baseline_path(name)
+    payload = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "config": config or {},
+        "results": {key: round(value, 3) for key, value in results.items()},
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+    return path
+
+
+def load_baseline(name: str) -> Optional[dict]:
+    path = baseline_path(name)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def compare_to_baseline(
+    name: str,
+    results: Dict[str, float],
+    config: Optional[dict] = None,
+    threshold: float = DEFAULT_THRESHOLD
+) -> bool:
+    """Print each metric against the saved baseline; False if any regressed past ``threshold``."""
+    baseline = load_baseline(name)
+    if baseline is None:
+        print(f"No baseline saved for {name!r}; run with --save-baseline first")
+        return True
+    if config is not None and baseline.get("config") != json.loads(json.dumps(config)):
+        print(f"Note: baseline was recorded with {baseline.get('config')}, this run used {config}")
+    
+    print(f"\nAgainst baseline from {baseline['created']} (regression threshold {threshold:.0%}):")
+    ok = True
+    for key, value in results.items():
+        old = baseline["results"].get(key)
+        if not old:
+            print(f"  {key:<40}{value:>12.3f}  (new)")
+            continue
+        change = (value - old) / old
+        worse = -change if key.endswith("rps") else change
+        flag = "REGRESSION" if worse > threshold else ""
+        ok = ok and not flag
+        print(f"  {key:<40}{value:>12.3f}  {old:>12.3f}  {change:>+8.1%}  {flag}")
+    return ok
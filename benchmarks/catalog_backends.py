@@ -0,0 +1,146 @@
+"""Compare catalog filtering/ranking backends.
+
+    python -m benchmarks.catalog_backends [--sizes 40,10000,1000000] [--repeat 20]
+
+Backends:
+  list      the original PhoneDAO.search + sort_phones list comprehensions
+  index     PhoneIndex (bitsets, bisect ranges, presorted orderings)
+  columnar  ColumnarPhoneIndex (NumPy masks + partial sort), built from raw dicts
+"""
+import argparse
+import gc
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.synthetic import phones_from_records, synthetic_records
+from backend.dao.columnar import ColumnarPhoneIndex, numpy_available
+from backend.dao.phone_index import PhoneIndex
+from backend.dto import PhoneDTO
+
+QUERIES = [
+    {"budget_max": 30000, "features": ["5G"], "sort_by": "camera"},
+    {"budget_min": 20000, "budget_max": 40000, "brand": "Samsung", "sort_by": "price"},
+    {"min_battery_mah": 6000, "min_ram_gb": 8, "sort_by": "battery"},
+    {"features": ["IP68", "Wireless charging"], "min_camera_mp": 50, "sort_by": "price_desc"},
+    {"budget_max": 15000, "sort_by": "performance"},
+]
+
+
+def list_search(
+    phones: List[PhoneDTO],
+    budget_min: Optional[int] = None,
+    budget_max: Optional[int] = None,
+    brand: Optional[str] = None,
+    features: Optional[List[str]] = None,
+    min_camera_mp: Optional[int] = None,
+    min_battery_mah: Optional[int] = None,
+    min_ram_gb: Optional[int] = None,
+    sort_by: str = "price"
+) -> List[PhoneDTO]:
+    # Verbatim copy of the pre-index PhoneDAO.search + sort_phones path
+    results = phones
+    if budget_min:
+        results = [p for p in results if p.price >= budget_min]
+    if budget_max:
+        results = [p for p in results if p.price <= budget_max]
+    if brand:
+        brand_lower = brand.lower()
+        results = [p for p in results if p.brand.lower() == brand_lower]
+    if features:
+        features_lower = [f.lower() for f in features]
+        results = [
+            p for p in results
+            if any(f in [pf.lower() for pf in p.features] for f in features_lower)
+        ]
+    if min_camera_mp:
+        results = [p for p in results if p.specs.camera.main_mp >= min_camera_mp]
+    if min_battery_mah:
+        results = [p for p in results if p.specs.battery_mah >= min_battery_mah]
+    if min_ram_gb:
+        results = [p for p in results if p.specs.ram_gb >= min_ram_gb]
+    
+    keys = {
+        "price": (lambda p: p.price, False),
+        "camera": (lambda p: p.specs.camera.main_mp, True),
+        "battery": (lambda p: p.specs.battery_mah, True),
+        "performance": (lambda p: p.specs.ram_gb, True),
+        "price_desc": (lambda p: p.price, True),
+    }
+    key, reverse = keys[sort_by]
+    return sorted(results, key=key, reverse=reverse)[:5]
+
+
+def timed(fn: Callable, repeat: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(size: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    records = synthetic_records(size)
+    results: Dict[str, Dict[str, float]] = {}
+    
+    gc.collect()
+    start = time.perf_counter()
+    phones = phones_from_records(records)
+    build_list = (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    index = PhoneIndex(phones)
+    build_index = (time.perf_counter() - start) * 1000
+    
+    def run_list():
+        return [list_search(phones, **query) for query in QUERIES]
+    
+    def run_index():
+        # Measure without PhoneIndex's range-mask cache to keep the comparison fair
+        index._range_cache.clear()
+        out = []
+        for query in QUERIES:
+            filters = {k: v for k, v in query.items() if k != "sort_by"}
+            out.append(index.select(index.filter_mask(**filters), sort_by=query["sort_by"], limit=5))
+        return out
+    
+    expected = [[p.id for p in rows] for rows in run_list()]
+    assert expected == [[p.id for p in rows] for rows in run_index()], "index results differ"
+    
+    results["list"] = {"build_ms": build_list, "query_ms": timed(run_list, repeat) / len(QUERIES)}
+    results["index"] = {"build_ms": build_index, "query_ms": timed(run_index, repeat) / len(QUERIES)}
+    
+    if numpy_available():
+        start = time.perf_counter()
+        columnar = ColumnarPhoneIndex.from_records(records)
+        build_columnar = (time.perf_counter() - start) * 1000
+        
+        def run_columnar():
+            out = []
+            for query in QUERIES:
+                filters = {k: v for k, v in query.items() if k != "sort_by"}
+                out.append(columnar.select_rows(columnar.filter_mask(**filters), sort_by=query["sort_by"], limit=5))
+            return out
+        
+        assert expected == [[records[row]["id"] for row in rows] for rows in run_columnar()], "columnar results differ"
+        results["columnar"] = {"build_ms": build_columnar, "query_ms": timed(run_columnar, repeat) / len(QUERIES)}
+    
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="40,10000,1000000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    print(f"{'rows':>9} {'backend':>9} {'build ms':>10} {'query ms':>10} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        results = run(size, args.repeat)
+        baseline = results["list"]["query_ms"]
+        for backend, stats in results.items():
+            speedup = baseline / stats["query_ms"] if stats["query_ms"] else float("inf")
+            print(f"{size:>9} {backend:>9} {stats['build_ms']:>10.1f} {stats['query_ms']:>10.3f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
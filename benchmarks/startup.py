@@ -0,0 +1,144 @@
+"""Cold start: how soon a fresh process serves /api/health, /api/phones and the first chat.
+
+    python -m benchmarks.startup [--runs 5] [--save-baseline] [--compare-baseline]
+
+Every run starts a new interpreter, so nothing is shared between runs:
+  import      time to import backend.main, and whether LangChain came with it
+  server      uvicorn subprocess; milliseconds from spawn until /api/health
+              and /api/phones answer, then the latency of the first chat
+  warmup      the same with WARMUP_ENABLED=true; spawn until /api/ready is
+              200, then the latency of the first chat after that
+
+Chats use the fake model (LLM_PROVIDER=fake) with no added latency, so the
+first-chat numbers are the lazy chat-stack import and nothing else.
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.baseline import compare_to_baseline, save_baseline
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import backend.main
+print(json.dumps({
+    "import_ms": (time.perf_counter() - started) * 1000,
+    "langchain_loaded": "langchain_core" in sys.modules,
+}))
+"""
+
+CHAT_BODY = json.dumps({"message": "Best camera phone under 30000?"})
+
+
+def child_env(**overrides: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+    env.update({"LLM_PROVIDER": "fake", "FAKE_LLM_LATENCY_MS": "0", "FAKE_LLM_CHUNK_LATENCY_MS": "0", "LOG_LEVEL": "WARNING"})
+    env.update(overrides)
+    return env
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def request(port: int, method: str, path: str, body: Optional[str] = None) -> Optional[int]:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        headers = {"Content-Type": "application/json"} if body else {}
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    except OSError:
+        return None
+    finally:
+        connection.close()
+
+
+def wait_for(port: int, path: str, started: float, timeout: float = 60) -> float:
+    """Milliseconds from ``started`` until ``path`` returns 200."""
+    while time.perf_counter() - started < timeout:
+        if request(port, "GET", path) == 200:
+            return (time.perf_counter() - started) * 1000
+        time.sleep(0.005)
+    raise TimeoutError(f"{path} not ready after {timeout:.0f}s")
+
+
+def timed_chat(port: int) -> float:
+    started = time.perf_counter()
+    status = request(port, "POST", "/api/chat", CHAT_BODY)
+    if status != 200:
+        raise RuntimeError(f"/api/chat returned {status}")
+    return (time.perf_counter() - started) * 1000
+
+
+def run_import() -> Dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], env=child_env(), capture_output=True, text=True, check=True
+    ).stdout
+    probe = json.loads(output.strip().splitlines()[-1])
+    if probe["langchain_loaded"]:
+        print("warning: importing backend.main loaded LangChain")
+    return {"import_ms": probe["import_ms"]}
+
+
+def run_server(warmup: bool) -> Dict[str, float]:
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=child_env(WARMUP_ENABLED="true" if warmup else "false"),
+        stdout=subprocess.DEVNULL
+    )
+    try:
+        if warmup:
+            return {"warmup.ready_ms": wait_for(port, "/api/ready", started), "warmup.first_chat_ms": timed_chat(port)}
+        return {
+            "server.health_ms": wait_for(port, "/api/health", started),
+            "server.phones_ms": wait_for(port, "/api/phones", started),
+            "server.first_chat_ms": timed_chat(port),
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare-baseline", action="store_true")
+    args = parser.parse_args()
+    
+    samples: Dict[str, List[float]] = {}
+    for _ in range(args.runs):
+        for measured in (run_import(), run_server(warmup=False), run_server(warmup=True)):
+            for key, value in measured.items():
+                samples.setdefault(key, []).append(value)
+    
+    results: Dict[str, float] = {}
+    print(f"{'metric':<24}{'median ms':>11}{'min ms':>9}")
+    for key, values in samples.items():
+        results[key] = statistics.median(values)
+        print(f"{key:<24}{results[key]:>11.1f}{min(values):>9.1f}")
+    
+    config = {"runs": args.runs}
+    if args.save_baseline:
+        print(f"Saved {save_baseline('startup', results, config)}")
+    if args.compare_baseline and not compare_to_baseline("startup", results, config):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Synthetic catalogs for benchmarks, generated from the shipped phones.json."""
+import json
+import os
+import random
+from pathlib import Path
+from typing import Dict, List
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from backend.dto import CameraSpecs, PhoneDTO, PhoneSpecs
+
+CATALOG_FILE = Path(__file__).resolve().parent.parent / "backend" / "data" / "phones.json"
+BRANDS = ["Samsung", "Google", "OnePlus", "Xiaomi", "Realme", "Motorola", "Nothing", "Vivo", "Oppo", "iQOO"]
+SPEC_VARIANTS = 2000
+
+
+def base_records() -> List[Dict]:
+    with open(CATALOG_FILE, "r") as f:
+        return json.load(f)["phones"]
+
+
+def synthetic_records(n: int, seed: int = 7) -> List[Dict]:
+    """n catalog dicts. Nested spec dicts are drawn from a fixed pool of
+    variants so that million-row catalogs stay within a few hundred MB."""
+    rng = random.Random(seed)
+    base = base_records()
+    if n <= len(base):
+        return base[:n]
+    
+    variants = []
+    for i in range(SPEC_VARIANTS):
+        specs = json.loads(json.dumps(base[i % len(base)]["specs"]))
+        specs["camera"]["main_mp"] = rng.choice([12, 13, 48, 50, 64, 108, 200])
+        specs["battery_mah"] = rng.randrange(3500, 7000, 100)
+        specs["ram_gb"] = rng.choice([4, 6, 8, 12, 16])
+        specs["storage_gb"] = rng.choice([64, 128, 256, 512])
+        specs["refresh_rate_hz"] = rng.choice([60, 90, 120, 144])
+        variants.append(specs)
+    
+    records = []
+    for i in range(n):
+        template = base[i % len(base)]
+        records.append({
+            "id": i + 1,
+            "brand": rng.choice(BRANDS),
+            "model": f"{template['model']} #{i}",
+            "price": rng.randrange(6000, 150000, 500),
+            "specs": variants[rng.randrange(SPEC_VARIANTS)],
+            "features": template["features"],
+            "pros": template["pros"],
+            "cons": template["cons"],
+        })
+    return records
+
+
+def phones_from_records(records: List[Dict]) -> List[PhoneDTO]:
+    """Build DTOs, validating each distinct nested specs object only once."""
+    specs_cache: Dict[int, PhoneSpecs] = {}
+    phones = []
+    for record in records:
+        specs = specs_cache.get(id(record["specs"]))
+        if specs is None:
+            raw = record["specs"]
+            specs = PhoneSpecs(**{**raw, "camera": CameraSpecs(**raw["camera"])})
+            specs_cache[id(raw)] = specs
+        phones.append(PhoneDTO.model_construct(
+            id=record["id"],
+            brand=record["brand"],
+            model=record["model"],
+            price=record["price"],
+            specs=specs,
+            features=record["features"],
+            pros=record["pros"],
+            cons=record["cons"],
+        ))
+    return phones
@@ -0,0 +1,120 @@
+"""Measure how tool-result encodings change the prompt sent to the LLM.
+
+    python -m benchmarks.tool_payloads [--gemini]
+
+Replays a fixed multi-turn conversation through ShoppingAgentSession with a
+scripted model that records every prompt instead of calling Gemini, once per
+encoding. Reports the size of each tool result and the cumulative prompt
+bytes/tokens the conversation would have sent. Tokens are estimated at four
+characters per token unless --gemini is given, which asks the Gemini
+count_tokens endpoint (needs GOOGLE_API_KEY).
+"""
+import argparse
+import asyncio
+from typing import Callable, Dict, List, Tuple
+
+import benchmarks.synthetic  # noqa: F401  (sets a placeholder API key)
+from langchain_core.messages import AIMessage, BaseMessage
+from backend.agents.shopping_agent import ShoppingAgentSession, TOOLS_BY_NAME
+from backend.config import settings
+
+# (user message, tool calls the model makes for it)
+CONVERSATION: List[Tuple[str, List[Tuple[str, dict]]]] = [
+    ("Best camera phone under 30k?", [("search_phones", {"budget_max": 30000, "sort_by": "camera"})]),
+    ("Any Samsung 5G phones between 15k and 40k?", [
+        ("search_phones", {"budget_min": 15000, "budget_max": 40000, "brand": "Samsung", "features": ["5G"]}),
+    ]),
+    ("Compare Pixel 8a and OnePlus 12R", [("compare_phones", {"phone_models": ["Pixel 8a", "OnePlus 12R"]})]),
+    ("Tell me more about the Pixel 8a", [("get_phone_details", {"phone_model": "Pixel 8a"})]),
+    ("Big battery phones with fast charging", [
+        ("search_phones", {"min_battery_mah": 5000, "features": ["Fast charging"], "sort_by": "battery"}),
+    ]),
+    ("Compare Galaxy S23 FE, Nothing Phone 2a and Pixel 8a", [
+        ("compare_phones", {"phone_models": ["Galaxy S23 FE", "Nothing Phone 2a", "Pixel 8a"]}),
+    ]),
+]
+
+VARIANTS = [
+    ("pretty", True),
+    ("compact", True),
+    ("table", True),
+    ("table", False),
+]
+
+REPLY = "Here is what I found in the catalog based on your requirements."
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    parts = []
+    for message in messages:
+        parts.append(str(message.content))
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            parts.append(f"{tool_call['name']}{tool_call['args']}")
+    return "\n".join(parts)
+
+
+class RecordingModel:
+    """Replays scripted responses and keeps the text of every prompt."""
+    
+    def __init__(self):
+        self.script: List[AIMessage] = []
+        self.prompts: List[str] = []
+    
+    async def ainvoke(self, messages, **kwargs):
+        self.prompts.append(_prompt_text(messages))
+        return self.script.pop(0)
+
+
+def run_conversation(result_format: str, include_pros_cons: bool) -> Tuple[List[str], Dict[str, int]]:
+    settings.tool_result_format = result_format
+    settings.tool_result_pros_cons = include_pros_cons
+    
+    model = RecordingModel()
+    session = ShoppingAgentSession(llm=model)
+    tool_bytes: Dict[str, int] = {}
+    
+    for turn, (message, calls) in enumerate(CONVERSATION):
+        tool_calls = [{"name": name, "args": args, "id": f"t{turn}-{i}"} for i, (name, args) in enumerate(calls)]
+        model.script = [AIMessage(content="", tool_calls=tool_calls), AIMessage(content=REPLY)]
+        asyncio.run(session.achat(message))
+        for name, args in calls:
+            size = len(str(TOOLS_BY_NAME[name].invoke(args)).encode("utf-8"))
+            tool_bytes[name] = tool_bytes.get(name, 0) + size
+    
+    return model.prompts, tool_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gemini", action="store_true", help="count tokens with the Gemini API")
+    args = parser.parse_args()
+    
+    count_tokens: Callable[[str], int] = lambda text: (len(text) + 3) // 4
+    if args.gemini:
+        from backend.agents.shopping_agent import create_shopping_agent
+        count_tokens = create_shopping_agent().get_num_tokens
+    
+    # Measure encodings only; repeated calls must not be served from the cache
+    settings.tool_cache_enabled = False
+    saved = (settings.tool_result_format, settings.tool_result_pros_cons)
+    
+    print(f"{len(CONVERSATION)} turns, tokens {'from Gemini' if args.gemini else 'estimated at 4 chars/token'}")
+    print(f"{'format':<18}{'tool bytes':>12}{'prompt bytes':>14}{'prompt tokens':>15}{'vs pretty':>11}")
+    baseline = None
+    try:
+        for result_format, include_pros_cons in VARIANTS:
+            prompts, tool_bytes = run_conversation(result_format, include_pros_cons)
+            prompt_bytes = sum(len(text.encode("utf-8")) for text in prompts)
+            tokens = sum(count_tokens(text) for text in prompts)
+            baseline = baseline or tokens
+            label = result_format if include_pros_cons else f"{result_format} -pros"
+            print(
+                f"{label:<18}{sum(tool_bytes.values()):>12}{prompt_bytes:>14}{tokens:>15}"
+                f"{tokens / baseline:>10.0%}"
+            )
+    finally:
+        settings.tool_result_format, settings.tool_result_pros_cons = saved
+
+
+if __name__ == "__main__":
+    main()
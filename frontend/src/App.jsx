@@ -2,11 +2,12 @@ import React, { useState, useRef, useEffect } from 'react';
 import ChatMessage from './components/ChatMessage';
 import ChatInput from './components/ChatInput';
 import SuggestedQueries from './components/SuggestedQueries';
-import { sendMessage } from './services/api';
+import { streamMessage } from './services/api';
 
 function App() {
   const [messages, setMessages] = useState([]);
   const [loading, setLoading] = useState(false);
+  const [streaming, setStreaming] = useState(false);
   const [sessionId, setSessionId] = useState(null);
   const messagesEndRef = useRef(null);
 
@@ -18,27 +19,57 @@ function App() {
     scrollToBottom();
   }, [messages]);
 
+  const updateLastMessage = (text) => {
+    setMessages((prev) => [
+      ...prev.slice(0, -1),
+      { ...prev[prev.length - 1], text },
+    ]);
+  };
+
   const handleSendMessage = async (message) => {
     setMessages((prev) => [...prev, { text: message, isUser: true }]);
     setLoading(true);
+    setStreaming(true);
+
+    let partial = '';
+    let started = false;
 
     try {
-      const response = await sendMessage(message, sessionId);
-      setSessionId(response.session_id);
-      setMessages((prev) => [
-        ...prev,
-        { text: response.response, isUser: false },
-      ]);
+      const finalEvent = await streamMessage(message, sessionId, (event) => {
+        if (event.type !== 'token') return;
+        partial += event.content;
+        if (!started) {
+          started = true;
+          setLoading(false);
+          setMessages((prev) => [...prev, { text: partial, isUser: false }]);
+        } else {
+          updateLastMessage(partial);
+        }
+      });
+
+      if (finalEvent.type === 'error') {
+        throw new Error(finalEvent.content);
+      }
+
+      setSessionId(finalEvent.session_id);
+      if (started) {
+        updateLastMessage(finalEvent.response);
+      } else {
+        setMessages((prev) => [
+          ...prev,
+          { text: finalEvent.response, isUser: false },
+        ]);
+      }
     } catch (error) {
-      setMessages((prev) => [
-        ...prev,
-        {
-          text: 'Sorry, something went wrong. Please try again.',
-          isUser: false,
-        },
-      ]);
+      const fallback = 'Sorry, something went wrong. Please try again.';
+      if (started) {
+        updateLastMessage(fallback);
+      } else {
+        setMessages((prev) => [...prev, { text: fallback, isUser: false }]);
+      }
     } finally {
       setLoading(false);
+      setStreaming(false);
     }
   };
 
@@ -96,7 +127,7 @@ function App() {
 
         <div className="bg-white">
           <div className="max-w-4xl mx-auto">
-            <ChatInput onSend={handleSendMessage} disabled={loading} />
+            <ChatInput onSend={handleSendMessage} disabled={loading || streaming} />
           </div>
         </div>
       </main>
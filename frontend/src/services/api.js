@@ -17,6 +17,60 @@ export const sendMessage = async (message, sessionId = null) => {
   return response.data;
 };
 
+// Streams a chat turn over SSE. onEvent receives each ChatStreamEvent
+// ({ type: 'token' | 'tool_start' | 'tool_end' | 'done' | 'error', ... }).
+// Resolves with the final 'done' (or 'error') event.
+export const streamMessage = async (message, sessionId = null, onEvent = () => {}) => {
+  const response = await fetch(`${API_BASE_URL}/api/chat/stream`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({
+      message,
+      session_id: sessionId,
+    }),
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error(`Stream request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let finalEvent = null;
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    const frames = buffer.split('\n\n');
+    buffer = frames.pop();
+
+    for (const frame of frames) {
+      const data = frame
+        .split('\n')
+        .filter((line) => line.startsWith('data: '))
+        .map((line) => line.slice(6))
+        .join('\n');
+      if (!data) continue;
+
+      const event = JSON.parse(data);
+      onEvent(event);
+      if (event.type === 'done' || event.type === 'error') {
+        finalEvent = event;
+      }
+    }
+  }
+
+  if (!finalEvent) {
+    throw new Error('Stream ended without a final event');
+  }
+  return finalEvent;
+};
+
 export const getPhones = async () => {
   const response = await api.get('/api/phones');
   return response.data;